@@ -50,6 +50,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'main_app.middleware.QueryBudgetMiddleware',  # Logs views that exceed QUERY_BUDGETS
 ]
 
 ROOT_URLCONF = 'legacy_website.urls'
@@ -136,6 +137,45 @@ INSTAGRAM_APP_SECRET = 'fd1bfc72abdaa0e2efc74a386525ce82' # You must paste your
 INSTAGRAM_REDIRECT_URI = 'https://gyan.pythonanywhere.com/auth/callback/'
 
 
+# === FEED SETTINGS ===
+
+# Number of posts rendered per page of the home feed (the rest load on scroll).
+FEED_PAGE_SIZE = 10
+
+# Colleges with a larger audience (followers + members) are not fanned out on write;
+# their posts are read on demand when the feed is built.
+FEED_FANOUT_LIMIT = 5000
+
+# How many recent posts are copied into a timeline on follow or rebuild.
+FEED_TIMELINE_BACKFILL = 200
+
+
+# === QUERY BUDGETS (main_app/middleware.py) ===
+
+# Maximum queries per request, by URL name. Views not listed use QUERY_BUDGET_DEFAULT.
+QUERY_BUDGET_DEFAULT = 15
+QUERY_BUDGETS = {
+    'dashboard': 15,
+    'feed_api': 8,
+    'my_community': 12,
+    'college_community': 12,
+}
+# The same SQL executed more often than this in one request is reported as an N+1.
+QUERY_BUDGET_REPEATED_QUERY_LIMIT = 5
+# Raise QueryBudgetExceeded instead of logging a warning.
+QUERY_BUDGET_RAISE = False
+
+
+# === CACHE ===
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get('REDIS_URL', 'redis://localhost:6379/1'),  # Shared by all workers
+    },
+}
+
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
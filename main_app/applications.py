@@ -0,0 +1,150 @@
+# main_app/applications.py
+"""
+The event application (registration) write path.
+
+apply_to_event() is safe under a registration rush: the application row
+is inserted directly and a duplicate submit is caught by the (user, event)
+unique constraint instead of a racy exists() check. In the same
+transaction the event's EventRegistrationCounter row is incremented with
+a single conditional UPDATE ("... WHERE registered_count < capacity"),
+which the database serialises per event, so a capacity limit can never
+be overshot and the counter always matches the applications.
+
+The same transaction bumps the EventRegistrationDay row of the day, which
+gives organisers a per-day registrations series without scanning the
+applications. Withdrawals are counted down by the EventApplicationDetails
+post_delete receiver in models.py, and the reconcile_registration_counters
+command rebuilds every counter from the applications if they ever drift.
+
+When the database reports a lock or serialisation conflict (an
+OperationalError, e.g. SQLite's "database table is locked" or a Postgres
+deadlock during a rush), the whole transaction is retried with backoff.
+"""
+import random
+import time
+
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import EventApplicationDetails, EventRegistrationCounter, EventRegistrationDay
+
+
+APPLIED = 'applied'
+ALREADY_APPLIED = 'already_applied'
+EVENT_FULL = 'event_full'
+
+# Attempts of the application transaction when the database reports a lock conflict.
+APPLY_ATTEMPTS = 10
+# Backoff before the n-th retry: up to APPLY_RETRY_DELAY * 2 ** n seconds (randomised).
+APPLY_RETRY_DELAY = 0.02
+
+
+class _EventFull(Exception):
+    """Rolls back the application insert when no place is left."""
+
+
+def _reserve_place(event):
+    """Increments the event's counter unless it is at capacity; returns whether a place was taken."""
+    counters = EventRegistrationCounter.objects.filter(event_id=event.pk)
+    if event.capacity is not None:
+        counters = counters.filter(registered_count__lt=event.capacity)
+    if counters.update(registered_count=F('registered_count') + 1):
+        return True
+
+    # Either the event is full or it has no counter row yet (e.g. created before counters
+    # existed). A full event, the common case during a rush, costs one more indexed lookup.
+    if EventRegistrationCounter.objects.filter(event_id=event.pk).exists():
+        return False
+
+    # A new row starts from the real count, which includes the caller's application.
+    registered = EventApplicationDetails.objects.filter(event_id=event.pk).count()
+    _, created = EventRegistrationCounter.objects.get_or_create(
+        event_id=event.pk, defaults={'registered_count': registered}
+    )
+    if created:
+        return event.capacity is None or registered <= event.capacity
+    # The row exists (possibly created concurrently): the conditional UPDATE decides.
+    return bool(counters.update(registered_count=F('registered_count') + 1))
+
+
+def apply_to_event(event, user, application):
+    """
+    Saves `application` (an unsaved EventApplicationDetails, e.g. from
+    EventApplicationForm) for user and event. Returns APPLIED,
+    ALREADY_APPLIED or EVENT_FULL; nothing is written unless APPLIED.
+    """
+    application.user = user
+    application.event = event
+    for attempt in range(APPLY_ATTEMPTS):
+        try:
+            return _apply(event, user, application)
+        except OperationalError:
+            # Inside an outer transaction the conflict cannot be retried here.
+            if connection.in_atomic_block or attempt == APPLY_ATTEMPTS - 1:
+                raise
+            time.sleep(random.uniform(0, APPLY_RETRY_DELAY * 2 ** attempt))
+
+
+def _apply(event, user, application):
+    # A rolled back attempt may have assigned an id; every attempt is a fresh insert.
+    application.pk = None
+    try:
+        with transaction.atomic():
+            application.save(force_insert=True)
+            if not _reserve_place(event):
+                raise _EventFull
+            _count_registration_day(event, timezone.localdate(application.applied_at))
+    except IntegrityError:
+        # Only the (user, event) unique constraint means a duplicate submit.
+        if EventApplicationDetails.objects.filter(user=user, event_id=event.pk).exists():
+            return ALREADY_APPLIED
+        raise
+    except _EventFull:
+        return EVENT_FULL
+    return APPLIED
+
+
+def _count_registration_day(event, day):
+    days = EventRegistrationDay.objects.filter(event_id=event.pk, day=day)
+    if days.update(registered_count=F('registered_count') + 1):
+        return
+    try:
+        with transaction.atomic():
+            EventRegistrationDay.objects.create(event_id=event.pk, day=day, registered_count=1)
+    except IntegrityError:
+        # Another application created the day's row first; any other integrity error is re-raised.
+        if not days.update(registered_count=F('registered_count') + 1):
+            raise
+
+
+def withdraw_application(event, user):
+    """Deletes the user's application to the event; returns whether there was one."""
+    deleted, _ = EventApplicationDetails.objects.filter(event=event, user=user).delete()
+    return bool(deleted)
+
+
+def get_registration_series(event):
+    """Returns [(day, registrations), ...] for the event, oldest day first."""
+    return list(
+        EventRegistrationDay.objects.filter(event=event, registered_count__gt=0).order_by('day').values_list(
+            'day', 'registered_count')
+    )
+
+
+@transaction.atomic
+def reconcile_registration_counts(event):
+    """Rebuilds the event's counter and per-day rows from its applications."""
+    applications = EventApplicationDetails.objects.filter(event=event)
+    EventRegistrationCounter.objects.update_or_create(
+        event=event, defaults={'registered_count': applications.count()}
+    )
+
+    per_day = dict(
+        applications.annotate(day=TruncDate('applied_at')).values('day').annotate(total=Count('id')).values_list(
+            'day', 'total')
+    )
+    EventRegistrationDay.objects.filter(event=event).exclude(day__in=per_day).delete()
+    for day, total in per_day.items():
+        EventRegistrationDay.objects.update_or_create(event=event, day=day, defaults={'registered_count': total})
@@ -0,0 +1,313 @@
+# main_app/colleges.py
+"""
+In-process college name index for the autocompletes.
+
+All college names are loaded once per process into two sorted arrays:
+the case-folded full names, and every word of every name ("indian",
+"institute", "technology", ...). A prefix lookup is then a bisect into
+the sorted array, with no database hit. Prefixes shared by many entries
+("c", "inst", "college") keep their best matches precomputed, so short
+queries do not have to rank a large range.
+
+Results are ranked: names that start with the query first, then names
+in which every query term starts a word, each group shortest name first.
+If that leaves room, misspelt queries are completed with near matches
+from a trigram index (see fuzzy_match_colleges).
+
+Each process keeps its own copy. A College save or delete bumps
+COLLEGE_INDEX_VERSION_CACHE_KEY (see the receivers in models.py), and
+every process reloads its index the next time it sees a newer version.
+"""
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from .models import College
+
+
+COLLEGE_INDEX_VERSION_CACHE_KEY = 'colleges:index_version'
+AUTOCOMPLETE_LIMIT = 10
+# Prefixes matching more entries than this get their best matches precomputed
+# ("c", "col", "college", "eng", ...), so common prefixes never sort a large range.
+HOT_PREFIX_MIN_MATCHES = 256
+# Number of best matches stored per hot prefix.
+HOT_PREFIX_RESULTS = 50
+# Names at least this similar to the query (shared trigrams / all trigrams,
+# like pg_trgm's similarity()) count as near matches. 0.3 is pg_trgm's default.
+FUZZY_MATCH_THRESHOLD = 0.3
+# Shorter queries are still being typed; near matches would only be noise.
+FUZZY_MIN_QUERY_LENGTH = 4
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# The loaded index of this process (see build_college_index).
+_index = None
+
+
+def fold(text):
+    """Case-folded, whitespace-collapsed form used for matching."""
+    return ' '.join((text or '').casefold().split())
+
+
+def get_college_by_name(name):
+    """
+    Returns the College whose name equals `name` ignoring case and spacing,
+    or None. Looked up on the indexed College.name_key only; keys left stale
+    by bulk writes are fixed with `manage.py repair_college_name_keys`.
+    """
+    key = fold(name)
+    if not key:
+        return None
+    return College.objects.filter(name_key=key).order_by('id').first()
+
+
+def link_college(instance):
+    """
+    Points instance.college (a UserProfile or Follow) at the College named
+    by instance.college_name, before it is saved.
+
+    college_name stays the source of truth while the foreign keys are rolled
+    out: every save re-links it (one indexed lookup, skipped when the name is
+    unchanged), and rows saved with only a College get its name. Names
+    without a College row are left unlinked.
+    """
+    college = instance._meta.get_field('college').get_cached_value(instance, default=None)
+    if college is not None and college.pk == instance.college_id:
+        if not instance.college_name or fold(instance.college_name) == fold(college.name):
+            instance.college_name = college.name
+            return
+    elif instance.college_id is not None and instance.college_name == getattr(instance, '_original_college_name', None):
+        return
+    instance.college = get_college_by_name(instance.college_name)
+
+
+def name_trigrams(text):
+    """
+    The set of trigrams of a name, computed like pg_trgm: every word is
+    padded with two spaces in front and one behind ("  iit ").
+    """
+    grams = set()
+    for word in _WORD_RE.findall(fold(text)):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def get_college_index_version():
+    version = cache.get(COLLEGE_INDEX_VERSION_CACHE_KEY)
+    if version is None:
+        version = bump_college_index_version()
+    return version
+
+
+def bump_college_index_version():
+    version = timezone.now().timestamp()
+    cache.set(COLLEGE_INDEX_VERSION_CACHE_KEY, version, None)
+    return version
+
+
+def _prefix_table(entries):
+    """
+    Turns (text, position) entries into a sorted prefix table: parallel
+    'keys'/'positions' arrays plus 'hot', the best HOT_PREFIX_RESULTS
+    positions of every prefix that matches many entries.
+    """
+    entries.sort()
+    keys = [text for text, _ in entries]
+    positions = [position for _, position in entries]
+
+    hot = {}
+    # Split large ranges one character at a time; a small range only has small sub-ranges.
+    pending = [(0, len(keys), 0)]
+    while pending:
+        lo, hi, depth = pending.pop()
+        start = lo
+        while start < hi:
+            if len(keys[start]) <= depth:
+                start += 1
+                continue
+            prefix = keys[start][:depth + 1]
+            end = bisect_left(keys, prefix + '\U0010ffff', start, hi)
+            if end - start > HOT_PREFIX_MIN_MATCHES:
+                # A name has an entry per matching word: store each position once.
+                hot[prefix] = heapq.nsmallest(HOT_PREFIX_RESULTS, set(positions[start:end]))
+                pending.append((start, end, depth + 1))
+            start = end
+    return {'keys': keys, 'positions': positions, 'hot': hot}
+
+
+def build_college_index():
+    """Loads every college name (one query) into sorted prefix tables."""
+    # Positions are in (name length, name) order, so a smaller position ranks higher.
+    rows = sorted(College.objects.values_list('id', 'name'), key=lambda row: (len(row[1]), row[1]))
+
+    folded = [fold(name) for _, name in rows]
+    words = [tuple(sorted(set(_WORD_RE.findall(name)))) for name in folded]
+
+    # Trigram posting lists: trigram -> positions of the names containing it.
+    trigrams = {}
+    gram_counts = []
+    for position, name in enumerate(folded):
+        grams = name_trigrams(name)
+        gram_counts.append(len(grams))
+        for gram in grams:
+            trigrams.setdefault(gram, []).append(position)
+
+    return {
+        'ids': [college_id for college_id, _ in rows],
+        'names': [name for _, name in rows],
+        'words': words,
+        'trigrams': trigrams,
+        'gram_counts': gram_counts,
+        'name_table': _prefix_table([(name, position) for position, name in enumerate(folded)]),
+        'word_table': _prefix_table([(word, position) for position, name_words in enumerate(words)
+                                     for word in name_words]),
+    }
+
+
+def get_college_index():
+    global _index
+    version = get_college_index_version()
+    if _index is None or _index['version'] != version:
+        index = build_college_index()
+        index['version'] = version
+        _index = index
+    return _index
+
+
+def _prefix_range(table, prefix):
+    keys = table['keys']
+    lo = bisect_left(keys, prefix)
+    return lo, bisect_left(keys, prefix + '\U0010ffff', lo)
+
+
+def _take(positions, limit, accept=None):
+    """The first `limit` distinct positions (in the given order) that pass accept(position)."""
+    seen = set()
+    matches = []
+    for position in positions:
+        if position in seen or (accept is not None and not accept(position)):
+            continue
+        seen.add(position)
+        matches.append(position)
+        if len(matches) == limit:
+            break
+    return matches
+
+
+def _best_positions(table, prefix, limit, accept=None):
+    """
+    The `limit` best distinct positions whose text in `table` starts with
+    prefix and that pass accept(position), best first.
+    """
+    hot = table['hot'].get(prefix)
+    if hot is not None:
+        matches = _take(hot, limit, accept)
+        if len(matches) == limit or len(hot) < HOT_PREFIX_RESULTS:
+            return matches
+
+    lo, hi = _prefix_range(table, prefix)
+    # Several words of one name can start with the prefix: rank each name once.
+    candidates = set(table['positions'][lo:hi])
+    if accept is None:
+        return heapq.nsmallest(limit, candidates)
+    return _take(sorted(candidates), limit, accept)
+
+
+def _fuzzy_positions(index, query, limit, threshold):
+    query_grams = name_trigrams(query)
+    if not query_grams:
+        return []
+    postings = index['trigrams']
+    gram_counts = index['gram_counts']
+
+    # similarity = shared / (query grams + name grams - shared) <= shared / query grams,
+    # so a near match shares at least `needed` of the query's trigrams.
+    needed = max(1, math.ceil(threshold * len(query_grams)))
+    shared = Counter()
+    for gram in query_grams:
+        shared.update(postings.get(gram, ()))
+
+    scored = []
+    for position, count in shared.items():
+        if count >= needed:
+            similarity = count / (len(query_grams) + gram_counts[position] - count)
+            if similarity >= threshold:
+                scored.append((-similarity, position))
+    return [position for _, position in heapq.nsmallest(limit, scored)]
+
+
+def fuzzy_match_colleges(query, limit=AUTOCOMPLETE_LIMIT, threshold=FUZZY_MATCH_THRESHOLD):
+    """
+    Returns up to `limit` [{'id', 'name'}, ...] of the colleges whose names
+    are most similar to the query by trigrams, most similar first. Catches
+    typos ("Instutute", "Bombey") that no prefix lookup would.
+
+    PostgreSQL answers it from the pg_trgm GIN index on College.name
+    (migration 0018); other databases use the trigram posting lists of the
+    in-process index.
+    """
+    if not fold(query):
+        return []
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            # The % operator (the one the GIN index serves) uses this threshold.
+            cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, false)", [str(threshold)])
+            cursor.execute(
+                "SELECT id, name FROM main_app_college WHERE name %% %s "
+                "ORDER BY similarity(name, %s) DESC, length(name), name LIMIT %s",
+                [query, query, limit],
+            )
+            return [{'id': college_id, 'name': name} for college_id, name in cursor.fetchall()]
+
+    index = get_college_index()
+    return [
+        {'id': index['ids'][position], 'name': index['names'][position]}
+        for position in _fuzzy_positions(index, query, limit, threshold)
+    ]
+
+
+def autocomplete_colleges(query, limit=AUTOCOMPLETE_LIMIT):
+    """
+    Returns up to `limit` [{'id', 'name'}, ...]: names starting with the
+    query first, then names in which every query term starts a word, then
+    near matches (fuzzy_match_colleges) for queries that look misspelt.
+    """
+    folded_query = fold(query)
+    terms = _WORD_RE.findall(folded_query)
+    if not terms:
+        return []
+    index = get_college_index()
+    name_words = index['words']
+
+    ranked = _best_positions(index['name_table'], folded_query, limit)
+
+    if len(ranked) < limit:
+        # Drive the word lookup with the term matching the fewest words, and check the others per name.
+        ranges = {term: _prefix_range(index['word_table'], term) for term in terms}
+        driver = min(terms, key=lambda term: ranges[term][1] - ranges[term][0])
+        others = [term for term in terms if term != driver]
+        already = set(ranked)
+
+        def accept(position):
+            return position not in already and all(
+                any(word.startswith(term) for word in name_words[position]) for term in others
+            )
+
+        ranked += _best_positions(index['word_table'], driver, limit - len(ranked), accept)
+
+    results = [{'id': index['ids'][position], 'name': index['names'][position]} for position in ranked]
+
+    if len(results) < limit and len(folded_query) >= FUZZY_MIN_QUERY_LENGTH:
+        seen = {result['id'] for result in results}
+        for match in fuzzy_match_colleges(query, limit):
+            if match['id'] not in seen and len(results) < limit:
+                results.append(match)
+    return results
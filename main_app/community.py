@@ -0,0 +1,64 @@
+# main_app/community.py
+"""
+Per-college aggregates shown on the community pages.
+
+CollegeStats keeps a member, post and follower count per college name. The
+receivers in models.py adjust the counters with F() increments as profiles,
+posts and follows change, so the community header never has to COUNT(*)
+over the big tables. The first change or read seen for a college (or the
+recount_college_stats command) computes the row from scratch.
+"""
+from django.db.models import F
+
+from .feed import move_author_timeline
+from .models import CollegeStats, Follow, Post, UserProfile
+
+
+def recount_college_stats(college_name):
+    """Recomputes one college's counters with COUNT queries."""
+    stats, _ = CollegeStats.objects.update_or_create(
+        college_name=college_name,
+        defaults={
+            'member_count': UserProfile.objects.filter(college_name=college_name).count(),
+            'post_count': Post.objects.filter(college_name=college_name).count(),
+            'follower_count': Follow.objects.filter(college_name=college_name).count(),
+        },
+    )
+    return stats
+
+
+def adjust_college_stats(college_name, **deltas):
+    """Atomically adds deltas (e.g. post_count=1) to a college's counters."""
+    if not college_name:
+        return
+    updated = CollegeStats.objects.filter(college_name=college_name).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if not updated:
+        # First change seen for this college: start from the real counts, not zero.
+        recount_college_stats(college_name)
+
+
+def get_college_stats(college_name):
+    """Returns the college's CollegeStats, counting it once if it has no row yet."""
+    if not college_name:
+        return CollegeStats(college_name=college_name)
+    stats = CollegeStats.objects.filter(college_name=college_name).first()
+    if stats is None:
+        stats = recount_college_stats(college_name)
+    return stats
+
+
+def move_member(user_id, old_college_name, new_college_name):
+    """
+    Moves a user, and the denormalised college on their posts, to another
+    college. Their posts follow them into the new audience's timelines.
+    """
+    adjust_college_stats(old_college_name, member_count=-1)
+    adjust_college_stats(new_college_name, member_count=1)
+
+    moved_posts = Post.objects.filter(author_id=user_id).update(college_name=new_college_name)
+    if moved_posts:
+        adjust_college_stats(old_college_name, post_count=-moved_posts)
+        adjust_college_stats(new_college_name, post_count=moved_posts)
+        move_author_timeline(user_id, new_college_name)
@@ -0,0 +1,145 @@
+# main_app/events.py
+"""
+Event read models shared by the sidebars and the event APIs.
+
+EVENTS_VERSION_CACHE_KEY holds a cheap "events changed" stamp (the time of
+the last Event save/delete, bumped by the receivers in models.py). Cached
+event data embeds the stamp in its key, so one bump invalidates every
+cached window at once without tracking which keys exist.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Event
+
+
+EVENTS_VERSION_CACHE_KEY = 'events:version'
+
+# Number of events shown in the "Upcoming events" sidebar.
+UPCOMING_EVENTS_WINDOW = 10
+# Upper bound on how long an upcoming-events window is cached.
+UPCOMING_EVENTS_CACHE_TIMEOUT = 60 * 15
+# Rows fetched per round trip when streaming the public events feed.
+EVENTS_STREAM_CHUNK_SIZE = 500
+# Anonymous event pages are cached until the event changes; this only bounds stale entries.
+EVENT_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_events_version():
+    """Returns the current events stamp (a POSIX timestamp of the last change)."""
+    version = cache.get(EVENTS_VERSION_CACHE_KEY)
+    if version is None:
+        version = bump_events_version()
+    return version
+
+
+def bump_events_version():
+    version = timezone.now().timestamp()
+    cache.set(EVENTS_VERSION_CACHE_KEY, version, None)
+    return version
+
+
+def get_events_last_modified():
+    """The events stamp as an aware datetime, for Last-Modified headers."""
+    return datetime.fromtimestamp(get_events_version(), tz=dt_timezone.utc)
+
+
+def get_month_window(month=None):
+    """
+    Returns the (start, end) datetimes of a 'YYYY-MM' calendar month, end
+    exclusive, defaulting to the current month. Raises ValueError on a
+    malformed month.
+    """
+    if month:
+        first_day = datetime.strptime(month, '%Y-%m')
+    else:
+        first_day = timezone.localtime().replace(day=1, tzinfo=None)
+    start = timezone.make_aware(first_day.replace(day=1, hour=0, minute=0, second=0, microsecond=0))
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start, end
+
+
+def event_page_cache_key(event_link_key):
+    return f'events:page:{event_link_key}'
+
+
+def invalidate_event_page(event):
+    if event.event_link_key:
+        cache.delete(event_page_cache_key(event.event_link_key))
+
+
+def _audience_key(college_name):
+    if not college_name:
+        return 'global'
+    # College names are long free text; hash them into a safe cache key.
+    return 'college:' + hashlib.md5(college_name.encode('utf-8')).hexdigest()
+
+
+def get_upcoming_events(college_name=None):
+    """
+    Returns the next UPCOMING_EVENTS_WINDOW events, either for everyone or
+    only those organised by members of college_name, as template-ready dicts.
+
+    The window is cached until an event changes (version bump), or until the
+    first event in it starts, whichever happens first.
+    """
+    cache_key = f'events:upcoming:{_audience_key(college_name)}:{get_events_version()}'
+    events = cache.get(cache_key)
+    if events is None:
+        now = timezone.now()
+        queryset = Event.objects.filter(date_time__gte=now)
+        if college_name:
+            queryset = queryset.filter(organizer__userprofile__college_name=college_name)
+
+        events = [
+            {
+                'event_name': row['event_name'],
+                'event_link_key': row['event_link_key'],
+                'event_type': {'name': row['event_type__name'] or ''},
+                'organizer': {'email': row['organizer__email']},
+                'location': row['location'],
+                'date_time': row['date_time'],
+                'registration_fees': row['registration_fees'],
+                'phone_number': row['phone_number'],
+                'show_phone_number_on_query': row['show_phone_number_on_query'],
+            }
+            for row in queryset.order_by('date_time').values(
+                'event_name', 'event_link_key', 'event_type__name', 'organizer__email', 'location',
+                'date_time', 'registration_fees', 'phone_number', 'show_phone_number_on_query',
+            )[:UPCOMING_EVENTS_WINDOW]
+        ]
+
+        # Expire as soon as the first event has started so it drops out of the window.
+        timeout = UPCOMING_EVENTS_CACHE_TIMEOUT
+        if events:
+            seconds_to_first = int((events[0]['date_time'] - now).total_seconds()) + 1
+            timeout = max(1, min(timeout, seconds_to_first))
+        cache.set(cache_key, events, timeout)
+    return events
+
+
+def stream_events_json(queryset):
+    """
+    Yields queryset's events as a JSON array ([{'date', 'title', 'summary'}, ...])
+    one element at a time. Rows are read as tuples through a server-side cursor,
+    so memory use does not grow with the number of events.
+    """
+    rows = queryset.values_list('date_time', 'event_name', 'location', 'registration_fees').iterator(
+        chunk_size=EVENTS_STREAM_CHUNK_SIZE
+    )
+    separator = '['
+    for date_time, event_name, location, registration_fees in rows:
+        yield separator + json.dumps({
+            'date': date_time.date().isoformat(),
+            'title': event_name,
+            'summary': f"{event_name}, Location: {location}, Fees: {registration_fees}",
+        })
+        separator = ','
+    yield ']' if separator == ',' else '[]'
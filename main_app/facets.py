@@ -0,0 +1,216 @@
+# main_app/facets.py
+"""
+Faceted filtering of upcoming events.
+
+The event filters (type, fees, college, state, "my college", "applied")
+are answered from an in-memory index instead of one SQL query per
+combination. The index holds the upcoming event ids ordered by start
+time, plus one posting list per facet value. Each posting list is a
+bitmap (a Python int) with bit i set when the i-th event has that value,
+so combining filters is a bitwise AND and a count is int.bit_count().
+
+The index is cached under the events version (see main_app/events.py),
+so any Event save or delete makes the next request rebuild it.
+
+    event_ids, counts = search_events(parse_event_filters(request.GET), request.user)
+    # event_ids: matching ids, in start-time order
+    # counts: {'event_type': {3: 12, ...}, 'fees': {'free': 40, 'paid': 7}, ...}, each
+    # value counted with every *other* active filter applied, i.e. what selecting it would return.
+"""
+import hashlib
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .colleges import fold
+from .events import get_events_version, UPCOMING_EVENTS_CACHE_TIMEOUT
+from .models import Event, EventApplicationDetails
+
+
+# Facets that have a posting list per value in the shared index.
+INDEXED_FACETS = ('event_type', 'fees', 'college', 'state')
+# How long a built index is kept (it is also dropped on every events version bump).
+FACET_INDEX_TIMEOUT = 60 * 60
+
+
+def parse_event_filters(params):
+    """Reads the query parameters shared by the event filter APIs into a filters dict."""
+    event_type = params.get('event_type', '')
+    return {
+        'event_type': int(event_type) if event_type.isdigit() else None,
+        'fees': params.get('fees') if params.get('fees') in ('free', 'paid') else '',
+        'college': params.get('college_name', '').strip(),
+        'state': params.get('state', '').strip(),
+        'my_college_only': params.get('my_college_only', 'false') == 'true',
+        'applied_only': params.get('applied_filter', 'false') == 'true',
+    }
+
+
+def _state_key(state):
+    return (state or '').strip().casefold()
+
+
+def _college_key(college):
+    # Same key as College.name_key, so any spelling of a college name selects it.
+    return fold(college)
+
+
+def build_facet_index(since):
+    """Reads every event starting at or after `since` into posting lists (one query)."""
+    index = {
+        'ids': [],
+        'starts': [],  # POSIX start times, sorted, for bisecting date windows
+        'postings': {facet: {} for facet in INDEXED_FACETS},
+        'state_labels': {},  # case-folded state -> state as first written
+        'college_labels': {},  # college key -> college name as first written
+    }
+    postings = index['postings']
+
+    rows = Event.objects.filter(date_time__gte=since).order_by('date_time', 'id').values_list(
+        'id', 'date_time', 'event_type_id', 'registration_fees', 'organizer__userprofile__college_name', 'state',
+    )
+    for position, (event_id, date_time, event_type_id, fees, college, state) in enumerate(rows):
+        bit = 1 << position
+        index['ids'].append(event_id)
+        index['starts'].append(date_time.timestamp())
+
+        values = {
+            'event_type': event_type_id,
+            'fees': 'free' if fees is None else 'paid',
+            'college': _college_key(college) or None,
+            'state': _state_key(state) or None,
+        }
+        for facet, value in values.items():
+            if value is not None:
+                postings[facet][value] = postings[facet].get(value, 0) | bit
+        if values['state']:
+            index['state_labels'].setdefault(values['state'], state.strip())
+        if values['college']:
+            index['college_labels'].setdefault(values['college'], college)
+    return index
+
+
+def get_facet_index():
+    """Returns the index of events from the start of today, cached per events version."""
+    cache_key = f'events:facets:{get_events_version()}'
+    index = cache.get(cache_key)
+    if index is None:
+        day_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        index = build_facet_index(day_start)
+        cache.set(cache_key, index, FACET_INDEX_TIMEOUT)
+    return index
+
+
+def _window_mask(index, start=None, end=None):
+    # ids are sorted by start time, so a date window is a contiguous run of bits.
+    low = bisect_left(index['starts'], start.timestamp()) if start else 0
+    high = bisect_left(index['starts'], end.timestamp()) if end else len(index['starts'])
+    if high <= low:
+        return 0
+    return ((1 << (high - low)) - 1) << low
+
+
+def _ids_for(index, bitmap):
+    ids = index['ids']
+    result = []
+    while bitmap:
+        lowest = bitmap & -bitmap
+        result.append(ids[lowest.bit_length() - 1])
+        bitmap ^= lowest
+    return result
+
+
+def search_events(filters, user=None, start=None, end=None):
+    """
+    Returns (event_ids, counts) for `filters` over events starting in
+    [start, end) (default: from now on). `user` is needed for the "my
+    college" and "applied" filters.
+    """
+    index = get_facet_index()
+    postings = index['postings']
+    base = _window_mask(index, start or timezone.now(), end)
+
+    selected = {
+        'event_type': filters['event_type'],
+        'fees': filters['fees'],
+        'college': _college_key(filters['college']),
+        'state': _state_key(filters['state']),
+    }
+
+    # Per-user restrictions are not facets with counts; they narrow everything.
+    if filters['my_college_only']:
+        profile = getattr(user, 'userprofile', None)
+        user_college = profile.college_name if profile else ''
+        base &= postings['college'].get(_college_key(user_college), 0) if user_college else 0
+    if filters['applied_only']:
+        applied = 0
+        positions = {event_id: position for position, event_id in enumerate(index['ids'])}
+        for event_id in EventApplicationDetails.objects.filter(user=user).values_list('event_id', flat=True):
+            if event_id in positions:
+                applied |= 1 << positions[event_id]
+        base &= applied
+
+    masks = {
+        facet: postings[facet].get(value, 0) if value else None
+        for facet, value in selected.items()
+    }
+
+    matching = base
+    for mask in masks.values():
+        if mask is not None:
+            matching &= mask
+
+    counts = {}
+    for facet in INDEXED_FACETS:
+        # Disjunctive counting: apply every active filter except this facet's own.
+        others = base
+        for other_facet, mask in masks.items():
+            if other_facet != facet and mask is not None:
+                others &= mask
+        counts[facet] = {
+            value: (bitmap & others).bit_count()
+            for value, bitmap in postings[facet].items()
+            if bitmap & others
+        }
+    counts['state'] = {index['state_labels'][key]: total for key, total in counts['state'].items()}
+    counts['college'] = {index['college_labels'][key]: total for key, total in counts['college'].items()}
+
+    return _ids_for(index, matching), counts
+
+
+def get_calendar_heatmap(filters, user, start, end):
+    """
+    Returns {'days': {'YYYY-MM-DD': number of matching events}, 'facets':
+    counts} for events starting in [start, end). Days are grouped in SQL
+    (TruncDate + GROUP BY) over the ids matched by search_events. Cached per
+    events version and filter signature; the "applied" filter depends on the
+    user's applications and is not cached.
+    """
+    cache_key = None
+    if not filters['applied_only']:
+        user_college = ''
+        if filters['my_college_only']:
+            profile = getattr(user, 'userprofile', None)
+            user_college = profile.college_name if profile else ''
+        signature = repr((sorted(filters.items()), user_college, start.isoformat(), end.isoformat()))
+        cache_key = f'events:heatmap:{get_events_version()}:{hashlib.md5(signature.encode("utf-8")).hexdigest()}'
+        heatmap = cache.get(cache_key)
+        if heatmap is not None:
+            return heatmap
+
+    event_ids, facet_counts = search_events(filters, user, start=start, end=end)
+    rows = Event.objects.filter(id__in=event_ids).annotate(day=TruncDate('date_time')).values('day').annotate(
+        total=Count('id')).values_list('day', 'total')
+    heatmap = {'days': {day.isoformat(): total for day, total in rows}, 'facets': facet_counts}
+
+    if cache_key:
+        # The window starts with the current day, so it must not outlive it.
+        now = timezone.localtime()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        seconds_to_midnight = int((midnight - now).total_seconds()) + 1
+        cache.set(cache_key, heatmap, min(UPCOMING_EVENTS_CACHE_TIMEOUT, seconds_to_midnight))
+    return heatmap
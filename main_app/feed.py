@@ -0,0 +1,283 @@
+# main_app/feed.py
+"""
+Home feed queries.
+
+The feed is paginated with an opaque keyset cursor built from the last
+post's (created_at, id) pair, so every request reads at most one page of
+posts no matter how many colleges the user follows.
+
+Posts are fanned out on write: when a post is created its id is pushed into
+the TimelineEntry rows of everyone following (or belonging to) the author's
+college, so reading the home feed is a range scan over the user's own
+timeline. Colleges with a very large audience are skipped on write and read
+on demand instead (hybrid fan-out), which keeps a single post from
+producing hundreds of thousands of timeline rows.
+"""
+import base64
+import binascii
+from collections import Counter
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models import Q, Count, prefetch_related_objects
+
+from .models import Post, Follow, UserProfile, TimelineEntry
+
+
+# Number of recent posts from non-followed colleges mixed into the feed.
+GENERAL_POSTS_LIMIT = 10
+
+# Name of the cached card body fragment in includes/post_cards.html.
+POST_CARD_BODY_FRAGMENT = 'post_card_body'
+
+HIGH_FANOUT_COLLEGES_CACHE_KEY = 'feed:high_fanout_colleges'
+HIGH_FANOUT_COLLEGES_CACHE_TIMEOUT = 60 * 10
+
+
+class InvalidCursor(ValueError):
+    """Raised when a feed cursor cannot be decoded."""
+
+
+# --- Cursors ---
+
+def encode_cursor(row, field='created_at'):
+    """
+    Returns the opaque cursor pointing just after the given row of a
+    (field, id) keyset ordering: by default a post's (created_at, id).
+    """
+    value = getattr(row, field)
+    raw = f"{value.isoformat() if isinstance(value, datetime) else value}|{row.pk}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, parse=datetime.fromisoformat):
+    """Turns a cursor produced by encode_cursor back into (parse(value), id)."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        value_str, pk_str = raw.rsplit('|', 1)
+        return parse(value_str), int(pk_str)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise InvalidCursor(cursor)
+
+
+def apply_cursor(queryset, cursor, pk_field='pk'):
+    """Restricts a (-created_at, -pk) ordered queryset to rows after the cursor."""
+    if not cursor:
+        return queryset
+    created_at, pk = decode_cursor(cursor)
+    return queryset.filter(
+        Q(created_at__lt=created_at) | Q(created_at=created_at, **{f'{pk_field}__lt': pk})
+    )
+
+
+def paginate(queryset, cursor=None, page_size=None):
+    """
+    Returns (posts, next_cursor) for one page of the queryset.
+    next_cursor is None once the last page has been reached.
+    """
+    page_size = page_size or settings.FEED_PAGE_SIZE
+    queryset = apply_cursor(queryset, cursor).order_by('-created_at', '-id')
+
+    # Fetch one extra row to find out whether another page exists.
+    posts, next_cursor = _split_page(list(queryset[:page_size + 1]), page_size)
+    prefetch_uncached_media(posts)
+    return posts, next_cursor
+
+
+def prefetch_uncached_media(posts):
+    """
+    Loads media files only for posts whose rendered card body is not cached
+    (see includes/post_cards.html), so pages of hot posts skip the query.
+    """
+    keys = {
+        post.pk: make_template_fragment_key(POST_CARD_BODY_FRAGMENT, [post.pk, post.card_version])
+        for post in posts
+    }
+    cached_keys = cache.get_many(keys.values())
+    uncached_posts = [post for post in posts if keys[post.pk] not in cached_keys]
+    prefetch_related_objects(uncached_posts, 'media_files')
+
+
+def _split_page(posts, page_size):
+    next_cursor = None
+    if len(posts) > page_size:
+        posts = posts[:page_size]
+        next_cursor = encode_cursor(posts[-1])
+    return posts, next_cursor
+
+
+# --- Audiences ---
+
+def get_followed_college_names(user):
+    """Colleges whose posts appear in the user's feed (followed + own college)."""
+    followed_college_names = list(Follow.objects.filter(follower=user).values_list('college_name', flat=True))
+
+    user_college_name = user.userprofile.college_name
+    if user_college_name and user_college_name not in followed_college_names:
+        followed_college_names.append(user_college_name)
+    return followed_college_names
+
+
+def get_college_audience(college_name):
+    """Ids of the users whose home feed shows posts from the college."""
+    followers = Follow.objects.filter(college_name=college_name).values_list('follower_id', flat=True)
+    members = UserProfile.objects.filter(college_name=college_name).values_list('user_id', flat=True)
+    return set(followers) | set(members)
+
+
+def get_high_fanout_colleges():
+    """
+    Colleges whose audience exceeds FEED_FANOUT_LIMIT. Their posts are not
+    pushed into timelines; the feed reads them on demand instead.
+    """
+    colleges = cache.get(HIGH_FANOUT_COLLEGES_CACHE_KEY)
+    if colleges is None:
+        audience_sizes = Counter()
+        for row in Follow.objects.values('college_name').annotate(total=Count('id')):
+            audience_sizes[row['college_name']] += row['total']
+        for row in UserProfile.objects.values('college_name').annotate(total=Count('id')):
+            audience_sizes[row['college_name']] += row['total']
+
+        colleges = {name for name, total in audience_sizes.items() if total > settings.FEED_FANOUT_LIMIT}
+        cache.set(HIGH_FANOUT_COLLEGES_CACHE_KEY, colleges, HIGH_FANOUT_COLLEGES_CACHE_TIMEOUT)
+    return colleges
+
+
+# --- Fan-out on write ---
+
+def fan_out_post(post):
+    """Pushes a new post into the timeline of everyone in its college's audience."""
+    college_name = post.college_name
+    if not college_name or college_name in get_high_fanout_colleges():
+        return 0
+
+    entries = [
+        TimelineEntry(user_id=user_id, post=post, created_at=post.created_at)
+        for user_id in get_college_audience(college_name)
+    ]
+    TimelineEntry.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+    return len(entries)
+
+
+def backfill_timeline(user_id, college_names):
+    """Copies the most recent posts of the given colleges into a user's timeline."""
+    college_names = set(college_names) - get_high_fanout_colleges()
+    if not college_names:
+        return 0
+
+    recent_posts = Post.objects.filter(
+        college_name__in=college_names
+    ).order_by('-created_at', '-id').values_list('id', 'created_at')[:settings.FEED_TIMELINE_BACKFILL]
+
+    entries = [
+        TimelineEntry(user_id=user_id, post_id=post_id, created_at=created_at)
+        for post_id, created_at in recent_posts
+    ]
+    TimelineEntry.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+    return len(entries)
+
+
+def prune_timeline(user_id, college_name):
+    """Removes a college's posts from a user's timeline after an unfollow."""
+    if UserProfile.objects.filter(user_id=user_id, college_name=college_name).exists():
+        # Posts from the user's own college stay in the feed even without a Follow row.
+        return
+    TimelineEntry.objects.filter(user_id=user_id, post__college_name=college_name).delete()
+
+
+def move_author_timeline(user_id, college_name):
+    """
+    Re-targets a user's posts after they move to another college: the posts
+    leave the timelines outside the new college's audience, and the most
+    recent FEED_TIMELINE_BACKFILL of them are pushed to that audience (the
+    same depth a new follow backfills).
+    """
+    entries = TimelineEntry.objects.filter(post__author_id=user_id)
+    if not college_name or college_name in get_high_fanout_colleges():
+        # No audience, or one read on demand: the posts need no timeline rows.
+        entries.delete()
+        return 0
+
+    entries.exclude(
+        user_id__in=Follow.objects.filter(college_name=college_name).values('follower_id')
+    ).exclude(
+        user_id__in=UserProfile.objects.filter(college_name=college_name).values('user_id')
+    ).delete()
+
+    audience = get_college_audience(college_name)
+    recent_posts = Post.objects.filter(
+        author_id=user_id
+    ).order_by('-created_at', '-id').values_list('id', 'created_at')[:settings.FEED_TIMELINE_BACKFILL]
+
+    pushed = 0
+    for post_id, created_at in recent_posts:
+        # One post at a time, so memory stays bounded by the audience size.
+        TimelineEntry.objects.bulk_create([
+            TimelineEntry(user_id=audience_user_id, post_id=post_id, created_at=created_at)
+            for audience_user_id in audience
+        ], batch_size=1000, ignore_conflicts=True)
+        pushed += len(audience)
+    return pushed
+
+
+def rebuild_timeline(user):
+    """Recomputes a user's timeline from scratch (e.g. after changing college)."""
+    TimelineEntry.objects.filter(user=user).delete()
+    return backfill_timeline(user.id, get_followed_college_names(user))
+
+
+# --- Reading the feed ---
+
+def home_feed_queryset(user, cursor=None, page_size=None):
+    """
+    Builds the whole feed page as one ordered, limited SQL statement.
+
+    The followed + general mix is expressed as OR-ed conditions instead of
+    separate querysets, so the database merges and sorts the sources:
+
+    * the next page of the user's precomputed timeline (a LIMITed subquery
+      over the (user, -created_at, -post) index),
+    * the next page of posts of followed colleges too large to fan out, read
+      on demand through the (college_name, -created_at, -id) index,
+    * the few most recent posts from colleges the user does not follow.
+
+    Every source is a LIMITed subquery (the first two by the page size, the
+    last by GENERAL_POSTS_LIMIT), and rows shared by two sources come back
+    once.
+    """
+    page_size = page_size or settings.FEED_PAGE_SIZE
+    followed_college_names = get_followed_college_names(user)
+
+    timeline_post_ids = apply_cursor(
+        TimelineEntry.objects.filter(user=user), cursor, pk_field='post_id'
+    ).order_by('-created_at', '-post_id').values('post_id')[:page_size + 1]
+
+    general_post_ids = Post.objects.exclude(
+        college_name__in=followed_college_names
+    ).order_by('-created_at', '-id').values('id')[:GENERAL_POSTS_LIMIT]
+
+    feed_filter = Q(id__in=timeline_post_ids) | Q(id__in=general_post_ids)
+
+    high_fanout_followed = get_high_fanout_colleges().intersection(followed_college_names)
+    if high_fanout_followed:
+        high_fanout_post_ids = apply_cursor(
+            Post.objects.filter(college_name__in=high_fanout_followed), cursor
+        ).order_by('-created_at', '-id').values('id')[:page_size + 1]
+        feed_filter |= Q(id__in=high_fanout_post_ids)
+
+    return Post.objects.select_related('author__userprofile').filter(feed_filter)
+
+
+def get_home_feed_page(user, cursor=None, page_size=None):
+    """Returns (posts, next_cursor) for one page of the user's home feed."""
+    queryset = home_feed_queryset(user, cursor=cursor, page_size=page_size)
+    return paginate(queryset, cursor=cursor, page_size=page_size)
+
+
+def get_college_feed_page(college_name, cursor=None, page_size=None):
+    """Returns (posts, next_cursor) for one page of a college community feed."""
+    queryset = Post.objects.select_related('author__userprofile').filter(college_name=college_name)
+    return paginate(queryset, cursor=cursor, page_size=page_size)
@@ -5,7 +5,8 @@ from django.contrib.auth.models import User
 from django.forms import ClearableFileInput
 from django.core.exceptions import ValidationError
 from django.db.models import Q
-from .models import UserProfile, Post, Event, EventApplicationDetails, College
+from .models import UserProfile, Post, Event, EventApplicationDetails
+from .colleges import fuzzy_match_colleges, get_college_by_name
 
 
 class MultiFileInput(ClearableFileInput):
@@ -86,6 +87,7 @@ class EventCreationForm(forms.ModelForm):
             'state',  # Include the State field
             'date_time',
             'registration_fees',
+            'capacity',  # Optional registration limit
             'phone_number',
             'show_phone_number_on_query'
         ]
@@ -95,6 +97,9 @@ class EventCreationForm(forms.ModelForm):
             # This makes Django render a date-only picker (Point 6)
             'date_time': forms.DateInput(attrs={'type': 'date'}),
         }
+        labels = {
+            'capacity': 'Maximum Registrations (optional)',
+        }
 
     # Custom __init__ to set the description placeholder (Point 4)
     def __init__(self, *args, **kwargs):
@@ -194,14 +199,20 @@ class MandatoryProfileForm(forms.ModelForm):
             # Should be caught by required=True, but safe to check
             raise ValidationError("College Name is required.")
 
-        try:
-            # Look up the college name (case-insensitive)
-            college = College.objects.get(name__iexact=college_name)
-            # Store the college object for use in the save method
-            self._selected_college = college
-        except College.DoesNotExist:
+        # Look up the college name (case and spacing insensitive, on the indexed name_key)
+        college = get_college_by_name(college_name)
+        if college is None:
+            # Probably a typo: point the user at the closest names instead
+            suggestions = [match['name'] for match in fuzzy_match_colleges(college_name, limit=3)]
+            if suggestions:
+                raise ValidationError(
+                    "Please select a valid college name from the suggestions. Did you mean: %s?"
+                    % "; ".join(suggestions)
+                )
             raise ValidationError("Please select a valid college name from the suggestions.")
 
+        # Store the college object for use in the save method
+        self._selected_college = college
         return college_name
 
     # --- End New Cleaning Method ---
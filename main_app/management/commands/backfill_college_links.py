@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery, Max
+
+from main_app.colleges import get_college_by_name
+from main_app.models import College, Follow, UserProfile
+
+
+class Command(BaseCommand):
+    help = ("Links existing UserProfile and Follow rows to their College (the college foreign key) "
+            "by matching the college_name strings. Safe to re-run; only unlinked rows are touched. "
+            "Run repair_college_name_keys first if colleges were bulk-loaded.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help="Number of row ids updated per UPDATE statement.")
+
+    def handle(self, *args, **options):
+        for model in (UserProfile, Follow):
+            linked, unmatched = self._backfill(model, options['batch_size'])
+            self.stdout.write(
+                f"{model.__name__}: linked {linked} row(s), {unmatched} left without a matching college."
+            )
+        self.stdout.write(self.style.SUCCESS("College links backfilled."))
+
+    def _backfill(self, model, batch_size):
+        unlinked = model.objects.filter(college__isnull=True)
+        exact_college = College.objects.filter(name=OuterRef('college_name')).values('id')[:1]
+
+        max_id = unlinked.aggregate(max_id=Max('id'))['max_id'] or 0
+        linked = 0
+
+        # 1. Exact names, walking the table in id ranges so no single UPDATE locks every row.
+        for start in range(0, max_id + 1, batch_size):
+            linked += unlinked.filter(id__gte=start, id__lt=start + batch_size).exclude(
+                college_name=''
+            ).filter(college_name__in=College.objects.values('name')).update(college=Subquery(exact_college))
+
+        # 2. Other spellings (case, spacing): one indexed name_key lookup per distinct remaining name.
+        remaining = unlinked.exclude(college_name='').values_list('college_name', flat=True).distinct()
+        unmatched = 0
+        for college_name in list(remaining):
+            college = get_college_by_name(college_name)
+            rows = unlinked.filter(college_name=college_name)
+            if college is None:
+                unmatched += rows.count()
+                continue
+            # Only the link is written: the strings (and Follow's unique_together on them) are unchanged.
+            linked += rows.update(college=college)
+        return linked, unmatched
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery, Max, Value
+from django.db.models.functions import Coalesce
+
+from main_app.models import Post, UserProfile
+
+
+class Command(BaseCommand):
+    help = "Copies each author's UserProfile.college_name onto their posts (Post.college_name)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help="Number of post ids updated per UPDATE statement.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        author_college = UserProfile.objects.filter(user_id=OuterRef('author_id')).values('college_name')[:1]
+
+        max_id = Post.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        updated = 0
+
+        # Walk the table in id ranges so no single UPDATE holds locks on every post.
+        for start in range(0, max_id + 1, batch_size):
+            updated += Post.objects.filter(id__gte=start, id__lt=start + batch_size).update(
+                college_name=Coalesce(Subquery(author_college), Value(''))
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled the college of {updated} post(s)."))
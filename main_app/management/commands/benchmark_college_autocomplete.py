@@ -0,0 +1,54 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from main_app.colleges import autocomplete_colleges, build_college_index, get_college_index
+from main_app.models import College
+
+
+class Command(BaseCommand):
+    help = ("Compares the in-process college autocomplete index with the old "
+            "name__icontains ORM query on prefixes of real college names.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=200, help="Number of sample queries.")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        names = list(College.objects.values_list('name', flat=True))
+        if not names:
+            self.stdout.write(self.style.WARNING("No colleges to benchmark against."))
+            return
+
+        rng = random.Random(options['seed'])
+        queries = []
+        for _ in range(options['queries']):
+            name = rng.choice(names)
+            queries.append(name[:rng.randint(2, min(12, len(name)))])
+
+        start = time.perf_counter()
+        build_college_index()
+        build_ms = (time.perf_counter() - start) * 1000
+        get_college_index()  # warm this process's index
+
+        orm_times = self._time(queries, lambda q: list(College.objects.filter(name__icontains=q)[:10]))
+        index_times = self._time(queries, autocomplete_colleges)
+
+        self.stdout.write(f"{len(names)} colleges, {len(queries)} queries, index build {build_ms:.1f} ms")
+        for label, times in (('ORM icontains', orm_times), ('In-process index', index_times)):
+            self.stdout.write(
+                f"{label:>18}: median {statistics.median(times):8.3f} ms, "
+                f"p95 {sorted(times)[int(len(times) * 0.95) - 1]:8.3f} ms"
+            )
+        speedup = statistics.median(orm_times) / max(statistics.median(index_times), 1e-9)
+        self.stdout.write(self.style.SUCCESS(f"Index is {speedup:.0f}x faster (median)."))
+
+    def _time(self, queries, lookup):
+        times = []
+        for query in queries:
+            start = time.perf_counter()
+            lookup(query)
+            times.append((time.perf_counter() - start) * 1000)
+        return times
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from main_app.states import build_state_vocabulary
+
+
+class Command(BaseCommand):
+    help = ("Builds the cached state vocabulary used by the state autocomplete and event state "
+            "normalisation (e.g. after a deploy, so the first request does not build it).")
+
+    def handle(self, *args, **options):
+        vocabulary = build_state_vocabulary()
+        self.stdout.write(self.style.SUCCESS(f"Cached {len(vocabulary['names'])} state name(s)."))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from main_app.events import bump_events_version
+from main_app.models import Event
+from main_app.states import resolve_event_state
+
+
+class Command(BaseCommand):
+    help = ("Rewrites Event.state to the canonical College.state spelling, falling back to a state "
+            "found in the event location (for events saved before states were normalised).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Number of events read and updated per batch.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        changed = []
+        updated = 0
+
+        for event in Event.objects.only('id', 'state', 'location').iterator(chunk_size=batch_size):
+            state = resolve_event_state(event.state, event.location)
+            if state != event.state:
+                event.state = state
+                changed.append(event)
+            if len(changed) >= batch_size:
+                updated += Event.objects.bulk_update(changed, ['state'])
+                changed = []
+        if changed:
+            updated += Event.objects.bulk_update(changed, ['state'])
+
+        if updated:
+            # bulk_update skips the save() signals, so invalidate the cached event data here.
+            bump_events_version()
+        self.stdout.write(self.style.SUCCESS(f"Normalised the state of {updated} event(s)."))
@@ -0,0 +1,26 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from main_app.feed import rebuild_timeline
+
+
+class Command(BaseCommand):
+    help = "Recomputes the precomputed home timelines (e.g. after deploying fan-out or changing FEED_FANOUT_LIMIT)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Only rebuild the timeline of this username.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(userprofile__setup_complete=True).select_related('userprofile')
+        if options['user']:
+            users = users.filter(username=options['user'])
+
+        total_users = 0
+        total_entries = 0
+        for user in users.iterator(chunk_size=500):
+            total_entries += rebuild_timeline(user)
+            total_users += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {total_users} timeline(s) with {total_entries} entries."
+        ))
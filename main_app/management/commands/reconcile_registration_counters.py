@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from main_app.applications import reconcile_registration_counts
+from main_app.models import Event
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the per-event registration counters and per-day series from the applications."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, help="Only reconcile the event with this id.")
+
+    def handle(self, *args, **options):
+        events = Event.objects.order_by('id')
+        if options['event']:
+            events = events.filter(id=options['event'])
+
+        total_events = 0
+        for event in events.only('id').iterator(chunk_size=500):
+            reconcile_registration_counts(event)
+            total_events += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled registration counters of {total_events} event(s)."))
@@ -0,0 +1,29 @@
+from itertools import chain
+
+from django.core.management.base import BaseCommand
+
+from main_app.community import recount_college_stats
+from main_app.models import Follow, Post, UserProfile
+
+
+class Command(BaseCommand):
+    help = "Recomputes the cached member/post/follower counts of every college (fixes any counter drift)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--college', help="Only recount this college name.")
+
+    def handle(self, *args, **options):
+        if options['college']:
+            college_names = {options['college']}
+        else:
+            college_names = set(chain(
+                UserProfile.objects.exclude(college_name='').values_list('college_name', flat=True).distinct(),
+                Post.objects.exclude(college_name='').values_list('college_name', flat=True).distinct(),
+                Follow.objects.values_list('college_name', flat=True).distinct(),
+            ))
+            college_names.discard(None)
+
+        for college_name in sorted(college_names):
+            recount_college_stats(college_name)
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted stats for {len(college_names)} college(s)."))
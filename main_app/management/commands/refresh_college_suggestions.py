@@ -0,0 +1,23 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from main_app.suggestions import refresh_suggestions
+
+
+class Command(BaseCommand):
+    help = "Recomputes the precomputed 'Suggested Colleges' lists (run periodically, e.g. nightly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Only refresh the suggestions of this username.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(userprofile__setup_complete=True)
+        if options['user']:
+            users = users.filter(username=options['user'])
+
+        total_users = 0
+        for user in users.iterator(chunk_size=500):
+            refresh_suggestions(user)
+            total_users += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed college suggestions for {total_users} user(s)."))
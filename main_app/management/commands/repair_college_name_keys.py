@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from main_app.colleges import fold
+from main_app.models import College
+
+
+class Command(BaseCommand):
+    help = ("Recomputes College.name_key for colleges whose key is missing or stale (e.g. rows written by "
+            "bulk_create or queryset.update, which skip the pre_save receiver). Safe to re-run.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Number of colleges written per bulk UPDATE.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        stale = []
+        repaired = 0
+        for college in College.objects.only('id', 'name', 'name_key').iterator(chunk_size=batch_size):
+            key = fold(college.name)
+            if college.name_key != key:
+                college.name_key = key
+                stale.append(college)
+            if len(stale) == batch_size:
+                College.objects.bulk_update(stale, ['name_key'])
+                repaired += len(stale)
+                stale = []
+        College.objects.bulk_update(stale, ['name_key'])
+        repaired += len(stale)
+
+        self.stdout.write(self.style.SUCCESS(f"Repaired the name key of {repaired} college(s)."))
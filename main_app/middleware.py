@@ -0,0 +1,95 @@
+# main_app/middleware.py
+"""
+Per-request database instrumentation.
+
+QueryBudgetMiddleware counts the queries and DB time of every request and
+detects N+1 patterns (the same SQL shape executed over and over). When a
+view goes over its budget (QUERY_BUDGETS, keyed by URL name, falling back
+to QUERY_BUDGET_DEFAULT) or repeats a query shape more than
+QUERY_BUDGET_REPEATED_QUERY_LIMIT times, it logs a warning, or raises
+QueryBudgetExceeded when QUERY_BUDGET_RAISE is set.
+
+Streaming responses (StreamingHttpResponse, FileResponse) produce their body
+after the middleware has returned, so only the queries run before the first
+chunk are counted here. QueryBudgetTestMixin (main_app/testing.py) reads
+the whole body inside its recorder, so the tests check those views in full.
+"""
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+# "IN (%s, %s, %s)" and "IN (%s)" are the same query shape.
+_IN_LIST_RE = re.compile(r'\((?:%s,\s*)+%s\)')
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a request exceeds its query budget and QUERY_BUDGET_RAISE is on."""
+
+
+class QueryRecorder:
+    """connection.execute_wrapper callable that records query count, time and shapes."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[_IN_LIST_RE.sub('(%s...)', sql)] += 1
+
+    def repeated_shapes(self, limit):
+        """SQL shapes executed more than `limit` times (likely N+1 queries)."""
+        return [(sql, total) for sql, total in self.shapes.most_common() if total > limit]
+
+
+def get_query_budget(url_name):
+    return settings.QUERY_BUDGETS.get(url_name, settings.QUERY_BUDGET_DEFAULT)
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            # A streamed body is read after this block: its queries are not counted.
+            response = self.get_response(request)
+
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        self.check_budget(request, url_name, recorder)
+
+        if settings.DEBUG:
+            response['Server-Timing'] = f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"'
+        return response
+
+    def check_budget(self, request, url_name, recorder):
+        problems = []
+
+        budget = get_query_budget(url_name)
+        if recorder.count > budget:
+            problems.append(f"{recorder.count} queries (budget {budget})")
+
+        for sql, total in recorder.repeated_shapes(settings.QUERY_BUDGET_REPEATED_QUERY_LIMIT):
+            problems.append(f"possible N+1, executed {total} times: {sql[:200]}")
+
+        if not problems:
+            return
+
+        message = f"Query budget exceeded for {request.method} {request.path} ({url_name}): " + '; '.join(problems)
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message + f" [{recorder.duration * 1000:.1f} ms in DB]")
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0007_timelineentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='college_name',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['college_name', '-created_at', '-id'], name='post_college_created_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0010_post_card_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollegeStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('college_name', models.CharField(max_length=500, unique=True)),
+                ('member_count', models.IntegerField(default=0)),
+                ('post_count', models.IntegerField(default=0)),
+                ('follower_count', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Full-text search index for events (see main_app/search.py).
+
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE main_app_event ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(event_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX event_search_vector_idx ON main_app_event USING gin (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS event_search_vector_idx",
+    "ALTER TABLE main_app_event DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE main_app_event_fts USING fts5(
+        event_name, location, description, tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    INSERT INTO main_app_event_fts (rowid, event_name, location, description)
+    SELECT id, event_name, location, description FROM main_app_event
+    """,
+]
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS main_app_event_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0011_collegestats'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
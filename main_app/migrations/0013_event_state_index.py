@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0012_event_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='state',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:20
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def populate_event_slugs(apps, schema_editor):
+    Event = apps.get_model('main_app', 'Event')
+    taken = set()
+    for event in Event.objects.order_by('id').only('id', 'event_name').iterator(chunk_size=1000):
+        base = slugify(event.event_name)[:200] or 'event'
+        slug, suffix = base, 2
+        while slug in taken:
+            slug, suffix = f'{base}-{suffix}', suffix + 1
+        taken.add(slug)
+        Event.objects.filter(pk=event.pk).update(slug=slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0013_event_state_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='slug',
+            field=models.SlugField(max_length=220, null=True),
+        ),
+        migrations.RunPython(populate_event_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='event',
+            name='slug',
+            field=models.SlugField(max_length=220, unique=True, blank=True),
+        ),
+    ]
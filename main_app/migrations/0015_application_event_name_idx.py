@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0014_event_slug'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventapplicationdetails',
+            index=models.Index(fields=['event', 'name', 'id'], name='application_event_name_idx'),
+        ),
+    ]
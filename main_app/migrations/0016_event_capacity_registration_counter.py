@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def create_registration_counters(apps, schema_editor):
+    Event = apps.get_model('main_app', 'Event')
+    EventRegistrationCounter = apps.get_model('main_app', 'EventRegistrationCounter')
+    events = Event.objects.annotate(registered=Count('eventapplicationdetails')).values_list('id', 'registered')
+    EventRegistrationCounter.objects.bulk_create(
+        [EventRegistrationCounter(event_id=event_id, registered_count=registered) for event_id, registered in events],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0015_application_event_name_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRegistrationCounter',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='registration_counter', serialize=False, to='main_app.event')),
+                ('registered_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(create_registration_counters, migrations.RunPython.noop),
+    ]
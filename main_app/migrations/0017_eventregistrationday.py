@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def create_registration_days(apps, schema_editor):
+    EventApplicationDetails = apps.get_model('main_app', 'EventApplicationDetails')
+    EventRegistrationDay = apps.get_model('main_app', 'EventRegistrationDay')
+    per_day = EventApplicationDetails.objects.annotate(day=TruncDate('applied_at')).values(
+        'event_id', 'day').annotate(total=Count('id')).values_list('event_id', 'day', 'total')
+    EventRegistrationDay.objects.bulk_create(
+        [EventRegistrationDay(event_id=event_id, day=day, registered_count=total) for event_id, day, total in per_day],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0016_event_capacity_registration_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRegistrationDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('registered_count', models.PositiveIntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registration_days', to='main_app.event')),
+            ],
+            options={
+                'unique_together': {('event', 'day')},
+            },
+        ),
+        migrations.RunPython(create_registration_days, migrations.RunPython.noop),
+    ]
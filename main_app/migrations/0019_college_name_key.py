@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:14
+
+from django.db import migrations, models
+
+
+def populate_name_keys(apps, schema_editor):
+    # Same folding as main_app.colleges.fold (historical models do not run College.save).
+    College = apps.get_model('main_app', 'College')
+    colleges = []
+    for college in College.objects.only('id', 'name').iterator(chunk_size=1000):
+        college.name_key = ' '.join(college.name.casefold().split())
+        colleges.append(college)
+        if len(colleges) == 1000:
+            College.objects.bulk_update(colleges, ['name_key'])
+            colleges = []
+    College.objects.bulk_update(colleges, ['name_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0018_college_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='college',
+            name='name_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=500),
+        ),
+        migrations.RunPython(populate_name_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0019_college_name_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='follow',
+            name='college',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='follows', to='main_app.college'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='college',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='members', to='main_app.college'),
+        ),
+    ]
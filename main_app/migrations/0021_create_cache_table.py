@@ -0,0 +1,20 @@
+# Creates the database cache table when settings select the DatabaseCache backend
+# (deployments without REDIS_URL, see CACHES in settings.py); a no-op otherwise.
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0020_college_links'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,10 @@
 import uuid
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, post_init, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
+from django.utils.text import slugify
 
 
 # Assuming you have a UserProfile model already
@@ -16,6 +17,8 @@ from django.utils import timezone
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     college_name = models.CharField(max_length=500)
+    # The College named by college_name, kept in step on save (see main_app/colleges.py).
+    college = models.ForeignKey('College', null=True, blank=True, on_delete=models.SET_NULL, related_name='members')
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     instagram_access_token = models.CharField(max_length=255, blank=True, null=True)
     instagram_user_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
@@ -40,10 +43,57 @@ class Post(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     post_text = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalised copy of the author's UserProfile.college_name, so feeds filter
+    # posts by college without joining Post -> User -> UserProfile.
+    # Kept in sync on profile saves; see the backfill_post_colleges command.
+    college_name = models.CharField(max_length=500, blank=True, default='')
+    # Part of the rendered post-card cache key (includes/post_cards.html). Bumped
+    # whenever the post, its media or its author's profile changes.
+    card_version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            # Backs the (created_at, id) keyset pagination of the feeds.
+            models.Index(fields=['-created_at', '-id'], name='post_created_id_idx'),
+            # Backs per-college feeds (community pages, followed colleges).
+            models.Index(fields=['college_name', '-created_at', '-id'], name='post_college_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Stamp the author's college at write time (covers the form and the Instagram webhook).
+        if not self.college_name and self.author_id:
+            self.college_name = UserProfile.objects.filter(user_id=self.author_id).values_list(
+                'college_name', flat=True).first() or ''
+        # An edited post must not be served from a stale cached card. Bumped in the database
+        # (like the MediaFile receivers do), so a stale instance cannot write back an old version.
+        bump_version = not self._state.adding
+        if bump_version:
+            self.card_version = models.F('card_version') + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'card_version'}
+        super().save(*args, **kwargs)
+        if bump_version:
+            self.refresh_from_db(fields=['card_version'])
 
     def __str__(self):
         return f'Post by {self.author.username}'
 
+class TimelineEntry(models.Model):
+    """A post pushed into a user's precomputed home timeline (fan-out on write)."""
+    user = models.ForeignKey(User, related_name='timeline_entries', on_delete=models.CASCADE)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    # Copied from the post so the timeline is read with a single index range scan.
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'post')
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-post'], name='timeline_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Post {self.post_id} in {self.user.username}'s timeline"
+
 class MediaFile(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='media_files')
     file = models.FileField(upload_to='post_media/')
@@ -52,8 +102,24 @@ class MediaFile(models.Model):
     def __str__(self):
         return f"Media for Post {self.post.id}"
 
+# Attempts of Event.save when a concurrent save takes the generated slug first.
+EVENT_SLUG_ATTEMPTS = 5
+
+
+def unique_event_slug(event_name, exclude_pk=None):
+    """slugify(event_name), suffixed with -2, -3, ... until no other event uses it."""
+    base = slugify(event_name)[:200] or 'event'
+    taken = set(Event.objects.filter(slug__startswith=base).exclude(pk=exclude_pk).values_list('slug', flat=True))
+    slug, suffix = base, 2
+    while slug in taken:
+        slug, suffix = f'{base}-{suffix}', suffix + 1
+    return slug
+
+
 class Event(models.Model):
     event_name = models.CharField(max_length=200)
+    # URL key of the events/<slug>/ page, set once on first save and kept across renames.
+    slug = models.SlugField(max_length=220, unique=True, blank=True)
     event_type = models.ForeignKey(
         'EventType', on_delete=models.SET_NULL, null=True
     )
@@ -65,14 +131,37 @@ class Event(models.Model):
     )
     description = models.TextField(default="No description provided.")
     location = models.CharField(max_length=250)
-    state = models.CharField(max_length=100, blank=True, null=True)
+    # Canonical College.state spelling, set in save() (see main_app/states.py), so
+    # state filters are indexed equality lookups.
+    state = models.CharField(max_length=100, blank=True, null=True, db_index=True)
     date_time = models.DateTimeField()
     registration_fees = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    # Maximum number of registrations; None means unlimited (enforced in main_app/applications.py).
+    capacity = models.PositiveIntegerField(null=True, blank=True)
     organizer = models.ForeignKey(User, on_delete=models.CASCADE)
     event_link_key = models.UUIDField(default=uuid.uuid4, editable=False, unique=True, null=True)
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     show_phone_number_on_query = models.BooleanField(default=True)
 
+    def save(self, *args, **kwargs):
+        from .states import resolve_event_state
+        self.state = resolve_event_state(self.state, self.location)
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        # unique_event_slug reads the taken slugs before the insert: an event saved in between
+        # with the same name takes the slug first, and this save retries with the next suffix.
+        for attempt in range(EVENT_SLUG_ATTEMPTS):
+            self.slug = unique_event_slug(self.event_name, exclude_pk=self.pk)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                slug_taken = Event.objects.filter(slug=self.slug).exclude(pk=self.pk).exists()
+                if not slug_taken or attempt == EVENT_SLUG_ATTEMPTS - 1:
+                    self.slug = ''
+                    raise
+
     def __str__(self):
         return self.event_name
 
@@ -87,13 +176,41 @@ class EventApplicationDetails(models.Model):
 
     class Meta:
         unique_together = ('user', 'event')
+        indexes = [
+            # Backs the (name, id) keyset pagination of the organiser's registrations page.
+            models.Index(fields=['event', 'name', 'id'], name='application_event_name_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} applied to {self.event.event_name}"
 
+class EventRegistrationCounter(models.Model):
+    """Live registration count of an event, updated atomically on every application (see main_app/applications.py)."""
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='registration_counter')
+    registered_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.event_id}: {self.registered_count} registered"
+
+
+class EventRegistrationDay(models.Model):
+    """Registrations received by an event on one day, for the organiser's time series."""
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='registration_days')
+    day = models.DateField()
+    registered_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('event', 'day')
+
+    def __str__(self):
+        return f"{self.event_id} on {self.day}: {self.registered_count}"
+
+
 class Follow(models.Model):
     follower = models.ForeignKey(User, related_name='following', on_delete=models.CASCADE)
     college_name = models.CharField(max_length=500)
+    # The College named by college_name, kept in step on save (see main_app/colleges.py).
+    college = models.ForeignKey('College', null=True, blank=True, on_delete=models.SET_NULL, related_name='follows')
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -104,11 +221,42 @@ class Follow(models.Model):
 
 class College(models.Model):
     name = models.CharField(max_length=500, unique=True)
+    # Case-folded, whitespace-collapsed name (colleges.fold), for indexed exact lookups.
+    name_key = models.CharField(max_length=500, db_index=True, editable=False, default='')
     state = models.CharField(max_length=200, null=True, blank=True)
+
     def __str__(self):
         return self.name
 
 
+class CollegeStats(models.Model):
+    """Per-college counters for the community pages, kept current by signals (see main_app/community.py)."""
+    college_name = models.CharField(max_length=500, unique=True)
+    member_count = models.IntegerField(default=0)
+    post_count = models.IntegerField(default=0)
+    follower_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.college_name}: {self.member_count} members, {self.post_count} posts"
+
+
+class CollegeSuggestion(models.Model):
+    """A precomputed "Suggested Colleges" candidate for a user (see main_app/suggestions.py)."""
+    user = models.ForeignKey(User, related_name='college_suggestions', on_delete=models.CASCADE)
+    college = models.ForeignKey(College, on_delete=models.CASCADE)
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'college')
+        indexes = [
+            models.Index(fields=['user', '-score'], name='suggestion_user_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.college.name} suggested to {self.user.username} ({self.score})"
+
+
 class EventCategory(models.Model):
     name = models.CharField(max_length=50, unique=True)
 
@@ -142,6 +290,10 @@ def manage_user_profile(sender, instance, created, **kwargs):
             college_name="Not Set (Mandatory Setup)", # Use a clear default
             setup_complete=False
         )
+    elif kwargs.get('update_fields') and set(kwargs['update_fields']) <= {'last_login'}:
+        # Logging in only touches last_login; re-saving the profile would needlessly
+        # invalidate the user's cached post cards.
+        pass
     else:
         # CRITICAL FIX 2: Check if the profile exists BEFORE trying to save it.
         # This prevents the UNIQUE constraint error.
@@ -152,6 +304,213 @@ def manage_user_profile(sender, instance, created, **kwargs):
             pass
 
 
+# ----------------------------------------------------------------------
+# HOME TIMELINE FAN-OUT (see main_app/feed.py)
+# ----------------------------------------------------------------------
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance, created, **kwargs):
+    """Pushes every new post (form or Instagram webhook) into its audience's timelines."""
+    if created:
+        from .feed import fan_out_post
+        fan_out_post(instance)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_timeline_on_follow(sender, instance, created, **kwargs):
+    if created:
+        from .feed import backfill_timeline
+        backfill_timeline(instance.follower_id, [instance.college_name])
+
+
+@receiver(post_delete, sender=Follow)
+def prune_timeline_on_unfollow(sender, instance, **kwargs):
+    from .feed import prune_timeline
+    prune_timeline(instance.follower_id, instance.college_name)
+
+
+# ----------------------------------------------------------------------
+# COLLEGE SUGGESTIONS (see main_app/suggestions.py)
+# ----------------------------------------------------------------------
+
+@receiver([post_save, post_delete], sender=Follow)
+def refresh_suggestions_on_follow_change(sender, instance, **kwargs):
+    """Following or unfollowing changes the user's co-follow neighbourhood."""
+    from .suggestions import refresh_suggestions
+    refresh_suggestions(instance.follower)
+
+
+# ----------------------------------------------------------------------
+# POST CARD CACHE INVALIDATION (see includes/post_cards.html)
+# ----------------------------------------------------------------------
+
+@receiver([post_save, post_delete], sender=MediaFile)
+def bump_card_version_on_media_change(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id).update(card_version=models.F('card_version') + 1)
+
+
+@receiver(post_save, sender=UserProfile)
+def bump_card_version_on_profile_change(sender, instance, created, **kwargs):
+    """The card shows the author's icon, name and college."""
+    if not created:
+        Post.objects.filter(author_id=instance.user_id).update(card_version=models.F('card_version') + 1)
+
+
+# ----------------------------------------------------------------------
+# COLLEGE LINKS (see main_app/colleges.py)
+# ----------------------------------------------------------------------
+
+@receiver(pre_save, sender=College)
+def set_college_name_key(sender, instance, **kwargs):
+    """Fills College.name_key on every save, including raw fixture loads (loaddata)."""
+    from .colleges import fold
+    instance.name_key = fold(instance.name)
+
+
+@receiver(pre_save, sender=UserProfile)
+@receiver(pre_save, sender=Follow)
+def link_college_on_save(sender, instance, **kwargs):
+    """Keeps the college foreign key in step with the college_name string."""
+    from .colleges import link_college
+    link_college(instance)
+
+
+# ----------------------------------------------------------------------
+# COLLEGE MEMBERSHIP AND STATS (see main_app/community.py)
+# ----------------------------------------------------------------------
+
+@receiver(post_init, sender=UserProfile)
+def remember_profile_college(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred college_name is not loaded just for this.
+    instance._original_college_name = instance.__dict__.get('college_name')
+
+
+@receiver(post_save, sender=UserProfile)
+def sync_college_on_profile_change(sender, instance, created, **kwargs):
+    """Keeps member counts and the denormalised Post.college_name in sync with the profile."""
+    from .community import adjust_college_stats, move_member
+    if created:
+        adjust_college_stats(instance.college_name, member_count=1)
+    elif instance._original_college_name is not None and instance.college_name != instance._original_college_name:
+        move_member(instance.user_id, instance._original_college_name, instance.college_name)
+        # Cached event windows and facets group events by their organizer's college. They only hold
+        # events from the start of today, so only organizers of those events invalidate them.
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        if Event.objects.filter(organizer_id=instance.user_id, date_time__gte=today).exists():
+            from .events import bump_events_version
+            bump_events_version()
+    instance._original_college_name = instance.college_name
+
+
+@receiver(post_delete, sender=UserProfile)
+def count_member_removed(sender, instance, **kwargs):
+    from .community import adjust_college_stats
+    adjust_college_stats(instance.college_name, member_count=-1)
+
+
+@receiver(post_save, sender=Post)
+def count_post_created(sender, instance, created, **kwargs):
+    if created:
+        from .community import adjust_college_stats
+        adjust_college_stats(instance.college_name, post_count=1)
+
+
+@receiver(post_delete, sender=Post)
+def count_post_removed(sender, instance, **kwargs):
+    from .community import adjust_college_stats
+    adjust_college_stats(instance.college_name, post_count=-1)
+
+
+@receiver(post_save, sender=Follow)
+def count_follower_added(sender, instance, created, **kwargs):
+    if created:
+        from .community import adjust_college_stats
+        adjust_college_stats(instance.college_name, follower_count=1)
+
+
+@receiver(post_delete, sender=Follow)
+def count_follower_removed(sender, instance, **kwargs):
+    from .community import adjust_college_stats
+    adjust_college_stats(instance.college_name, follower_count=-1)
+
+
+# ----------------------------------------------------------------------
+# EVENT CACHE INVALIDATION (see main_app/events.py)
+# ----------------------------------------------------------------------
+
+@receiver([post_save, post_delete], sender=Event)
+def bump_events_version_on_change(sender, instance, **kwargs):
+    """Any created, edited or deleted event invalidates every cached event window and its cached page."""
+    from .events import bump_events_version, invalidate_event_page
+    bump_events_version()
+    invalidate_event_page(instance)
+
+
+# ----------------------------------------------------------------------
+# REGISTRATION COUNTERS (see main_app/applications.py)
+# ----------------------------------------------------------------------
+
+@receiver(post_save, sender=Event)
+def create_registration_counter(sender, instance, created, **kwargs):
+    if created:
+        EventRegistrationCounter.objects.get_or_create(event=instance)
+
+
+@receiver(post_delete, sender=EventApplicationDetails)
+def count_registration_removed(sender, instance, **kwargs):
+    """Withdrawn (or otherwise deleted) applications leave the event's counters."""
+    EventRegistrationCounter.objects.filter(event_id=instance.event_id, registered_count__gt=0).update(
+        registered_count=models.F('registered_count') - 1
+    )
+    EventRegistrationDay.objects.filter(
+        event_id=instance.event_id, day=timezone.localdate(instance.applied_at), registered_count__gt=0
+    ).update(registered_count=models.F('registered_count') - 1)
+
+
+# ----------------------------------------------------------------------
+# EVENT SEARCH INDEX (see main_app/search.py)
+# ----------------------------------------------------------------------
+
+@receiver(post_save, sender=Event)
+def index_event_for_search(sender, instance, **kwargs):
+    from .search import index_event
+    index_event(instance)
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event_for_search(sender, instance, **kwargs):
+    from .search import unindex_event
+    unindex_event(instance.pk)
+
+
+# ----------------------------------------------------------------------
+# COLLEGE DATA INVALIDATION (see main_app/states.py and main_app/colleges.py)
+# ----------------------------------------------------------------------
+
+@receiver([post_save, post_delete], sender=College)
+def invalidate_state_vocabulary_on_change(sender, **kwargs):
+    from .states import invalidate_state_vocabulary
+    invalidate_state_vocabulary()
+
+
+@receiver([post_save, post_delete], sender=College)
+def reload_college_index_on_change(sender, **kwargs):
+    """Every process reloads its college autocomplete index on its next lookup."""
+    from .colleges import bump_college_index_version
+    bump_college_index_version()
+
+
+# ----------------------------------------------------------------------
+# SIDEBAR CACHE INVALIDATION (see main_app/sidebar.py)
+# ----------------------------------------------------------------------
+
+@receiver([post_save, post_delete], sender=EventCategory)
+@receiver([post_save, post_delete], sender=EventType)
+def invalidate_event_taxonomy_cache(sender, **kwargs):
+    from .sidebar import invalidate_event_taxonomy
+    invalidate_event_taxonomy()
+
+
 
 class ChatMessage(models.Model):
     """Stores messages for college-specific chat rooms."""
@@ -180,4 +539,4 @@ class ChatMessage(models.Model):
         return f'{self.user.username} in {self.college_room_slug} at {self.timestamp.strftime("%H:%M")}'
 
     class Meta:
-        ordering = ['timestamp']
\ No newline at end of file
+        ordering = ['timestamp']
@@ -0,0 +1,108 @@
+# main_app/registrations.py
+"""
+Reading an event's registrations (EventApplicationDetails) for organisers.
+
+The HTML list is paginated with a keyset cursor on (name, id), backed by
+the application_event_name_idx index, so each page is an index range
+scan whatever the size of the event. Exports stream rows from a
+server-side cursor instead of loading the whole registration list.
+"""
+import csv
+import importlib.util
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .feed import encode_cursor, decode_cursor
+from .models import EventApplicationDetails
+
+
+REGISTRATIONS_PAGE_SIZE = 50
+# Rows fetched per round trip while exporting.
+EXPORT_CHUNK_SIZE = 1000
+# XLSX exports are built in memory up to this size, then spill to a temporary file.
+EXPORT_XLSX_MEMORY_LIMIT = 5 * 1024 * 1024
+
+# (column header, EventApplicationDetails field) of the exported files.
+EXPORT_COLUMNS = [
+    ('Applicant Name', 'name'),
+    ('College Name', 'college_name'),
+    ('Email Address', 'email_id'),
+    ('WhatsApp Number', 'whatsapp_number'),
+    ('Registration Date', 'applied_at'),
+]
+
+# Leading characters that make Excel or LibreOffice read a cell as a formula (CSV/formula injection).
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def get_registrations_page(event, cursor=None, page_size=REGISTRATIONS_PAGE_SIZE):
+    """Returns (registrations, next_cursor) for one page of the event's registrations, by name."""
+    queryset = EventApplicationDetails.objects.filter(event=event)
+    if cursor:
+        name, pk = decode_cursor(cursor, parse=str)
+        queryset = queryset.filter(Q(name__gt=name) | Q(name=name, id__gt=pk))
+
+    registrations = list(queryset.order_by('name', 'id')[:page_size + 1])
+    next_cursor = None
+    if len(registrations) > page_size:
+        registrations = registrations[:page_size]
+        next_cursor = encode_cursor(registrations[-1], field='name')
+    return registrations, next_cursor
+
+
+# --- Exports ---
+
+def _export_cell(value):
+    """Quotes applicant-supplied text that a spreadsheet would otherwise evaluate as a formula."""
+    value = value or ''
+    if value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_registration_rows(event):
+    """Yields one list of cell values per registration, ordered by name, from a server-side cursor."""
+    fields = [field for _, field in EXPORT_COLUMNS]
+    rows = EventApplicationDetails.objects.filter(event=event).order_by('name', 'id').values_list(*fields)
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            timezone.localtime(value).strftime('%Y-%m-%d %H:%M') if field == 'applied_at' else _export_cell(value)
+            for field, value in zip(fields, row)
+        ]
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of storing it (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def stream_registrations_csv(event):
+    """Yields the event's registrations as CSV, one line at a time."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for row in iter_registration_rows(event):
+        yield writer.writerow(row)
+
+
+def xlsx_export_available():
+    """Whether openpyxl (needed by write_registrations_xlsx) is installed."""
+    return importlib.util.find_spec('openpyxl') is not None
+
+
+def write_registrations_xlsx(event, fileobj):
+    """
+    Writes the event's registrations to fileobj as an XLSX workbook. Needs
+    openpyxl; rows go out through a write-only worksheet, so they are never
+    all held in memory. Raises ImportError when openpyxl is not installed.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Registrations')
+    sheet.append([header for header, _ in EXPORT_COLUMNS])
+    for row in iter_registration_rows(event):
+        sheet.append(row)
+    workbook.save(fileobj)
@@ -0,0 +1,90 @@
+# main_app/search.py
+"""
+Full-text search over event names, locations and descriptions.
+
+The inverted index depends on the database:
+
+* PostgreSQL: a stored, generated ``search_vector`` tsvector column on
+  main_app_event (name weighted A, location B, description C) with a GIN
+  index. Postgres keeps it up to date on every INSERT/UPDATE.
+* SQLite: an FTS5 table, main_app_event_fts, whose rowid is the event id.
+  The Event receivers in models.py call index_event/unindex_event to keep
+  it in sync.
+
+Both are created by migration 0012. Every search term is prefix-matched
+("hack" finds "Hackathon"), all terms must match, and results are ranked
+(ts_rank on Postgres, bm25 on SQLite). Other databases fall back to an
+unranked icontains scan.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Event
+
+
+SQLITE_FTS_TABLE = 'main_app_event_fts'
+# Terms beyond this are ignored, so a pasted paragraph cannot build a huge query.
+MAX_SEARCH_TERMS = 8
+# bm25 weights of the event_name, location and description FTS5 columns.
+SQLITE_BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def get_search_terms(query):
+    """Splits a user query into lower-cased word terms (punctuation is dropped)."""
+    return _TERM_RE.findall((query or '').lower())[:MAX_SEARCH_TERMS]
+
+
+def search_event_ids(query, limit=20):
+    """Returns the ids of the events matching every term of `query`, best match first."""
+    terms = get_search_terms(query)
+    if not terms:
+        return []
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        sql = (
+            "SELECT id FROM main_app_event "
+            "WHERE search_vector @@ to_tsquery('english', %s) "
+            "ORDER BY ts_rank(search_vector, to_tsquery('english', %s)) DESC, date_time "
+            "LIMIT %s"
+        )
+        params = [tsquery, tsquery, limit]
+    elif connection.vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        sql = (
+            f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({SQLITE_FTS_TABLE}, {', '.join(map(str, SQLITE_BM25_WEIGHTS))}) LIMIT %s"
+        )
+        params = [match, limit]
+    else:
+        filters = Q()
+        for term in terms:
+            filters &= Q(event_name__icontains=term) | Q(location__icontains=term) | Q(description__icontains=term)
+        return list(Event.objects.filter(filters).order_by('date_time').values_list('id', flat=True)[:limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def index_event(event):
+    """Writes the event's searchable text to the SQLite FTS table (Postgres indexes itself)."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = %s", [event.pk])
+        cursor.execute(
+            f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, event_name, location, description) VALUES (%s, %s, %s, %s)",
+            [event.pk, event.event_name, event.location, event.description],
+        )
+
+
+def unindex_event(event_id):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = %s", [event_id])
@@ -0,0 +1,62 @@
+# main_app/sidebar.py
+"""
+Data shared by the sidebars of the dashboard-style pages (dashboard, my
+community, college community): the event filter taxonomy, the upcoming
+events window (see main_app/events.py) and the suggested colleges (see
+main_app/suggestions.py).
+
+The taxonomy rarely changes, so it is built with a single query, cached
+until an EventCategory/EventType is saved or deleted (see the receivers in
+models.py), and served from the cache on every other request.
+"""
+from django.core.cache import cache
+
+from .events import get_upcoming_events
+from .models import EventCategory
+from .suggestions import get_suggested_colleges
+
+
+EVENT_TAXONOMY_CACHE_KEY = 'sidebar:event_taxonomy'
+
+
+def get_categories_with_types():
+    """
+    Returns [{'category': {'id', 'name'}, 'types': [{'id', 'name'}, ...]}, ...]
+    ordered by category and type name, as used by the event filter dropdown.
+    """
+    categories_with_types = cache.get(EVENT_TAXONOMY_CACHE_KEY)
+    if categories_with_types is None:
+        categories_with_types = []
+
+        # One LEFT JOIN from categories to types; categories without types are kept.
+        rows = EventCategory.objects.order_by('name', 'eventtype__name').values_list(
+            'id', 'name', 'eventtype__id', 'eventtype__name'
+        )
+        for category_id, category_name, type_id, type_name in rows:
+            if not categories_with_types or categories_with_types[-1]['category']['id'] != category_id:
+                categories_with_types.append({
+                    'category': {'id': category_id, 'name': category_name},
+                    'types': [],
+                })
+            if type_id is not None:
+                categories_with_types[-1]['types'].append({'id': type_id, 'name': type_name})
+
+        # No timeout: the receivers in models.py invalidate it on change.
+        cache.set(EVENT_TAXONOMY_CACHE_KEY, categories_with_types, None)
+    return categories_with_types
+
+
+def invalidate_event_taxonomy():
+    cache.delete(EVENT_TAXONOMY_CACHE_KEY)
+
+
+def get_sidebar_context(user, college_name=None):
+    """
+    Context shared by every page rendered with dashboard.html's sidebars.
+    Community pages pass their college so the events sidebar shows that college's events.
+    """
+    return {
+        'upcoming_events': get_upcoming_events(college_name),
+        'suggested_colleges': get_suggested_colleges(user),
+        'categories_with_types': get_categories_with_types(),
+    }
@@ -0,0 +1,115 @@
+# main_app/states.py
+"""
+State names for events, normalised against the College.state vocabulary.
+
+Event.save() stores the canonical spelling of the state (as written in
+the College table) in the indexed Event.state column, so state filters
+are plain equality lookups. When the organiser typed no state, or one that
+is not in the vocabulary, the state is looked up in the free-text event
+location instead (e.g. "Hall 2, IIT Bombay, Mumbai, Maharashtra").
+
+The vocabulary is built once (on first use, or by the
+build_state_vocabulary command) and cached until a College is saved or
+deleted (see the receivers in models.py). It is kept both as a dict, for
+exact lookups, and as a sorted list that the state autocomplete bisects.
+"""
+import re
+from bisect import bisect_left
+from itertools import islice
+
+from django.core.cache import cache
+
+from .models import College
+
+
+STATE_VOCABULARY_CACHE_KEY = 'states:vocabulary'
+STATE_AUTOCOMPLETE_LIMIT = 10
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def clean_state_name(value):
+    """Strips and collapses whitespace; returns '' for None."""
+    return _WHITESPACE_RE.sub(' ', value or '').strip()
+
+
+def is_valid_state_name(name):
+    # Same heuristic as the state autocomplete: the College table holds some
+    # pin codes and abbreviations in its state column.
+    return not any(char.isdigit() for char in name) and len(name) > 3
+
+
+def build_state_vocabulary():
+    """Reads the states of the College table (one query) and caches the vocabulary."""
+    names = {}
+    for state in College.objects.exclude(state__isnull=True).values_list('state', flat=True).distinct():
+        name = clean_state_name(state)
+        if is_valid_state_name(name):
+            names.setdefault(name.casefold(), name)
+    vocabulary = {
+        'names': names,  # case-folded state -> canonical state
+        'sorted': sorted(names.items()),  # [(case-folded state, canonical state), ...]
+    }
+    # No timeout: the receivers in models.py invalidate it on change.
+    cache.set(STATE_VOCABULARY_CACHE_KEY, vocabulary, None)
+    return vocabulary
+
+
+def _load_state_vocabulary():
+    vocabulary = cache.get(STATE_VOCABULARY_CACHE_KEY)
+    if vocabulary is None:
+        vocabulary = build_state_vocabulary()
+    return vocabulary
+
+
+def get_state_vocabulary():
+    """Returns {case-folded state: canonical state} for every state in the College table."""
+    return _load_state_vocabulary()['names']
+
+
+def autocomplete_states(query, limit=STATE_AUTOCOMPLETE_LIMIT):
+    """Returns up to `limit` canonical states starting with the query (case-insensitive), sorted."""
+    prefix = clean_state_name(query).casefold()
+    states = _load_state_vocabulary()['sorted']
+    start = bisect_left(states, (prefix,))
+    results = []
+    for key, name in islice(states, start, start + limit):
+        if not key.startswith(prefix):
+            break
+        results.append(name)
+    return results
+
+
+def invalidate_state_vocabulary():
+    cache.delete(STATE_VOCABULARY_CACHE_KEY)
+
+
+def normalize_state(value):
+    """Returns the canonical spelling of a state name, or None if it is not a known state."""
+    return get_state_vocabulary().get(clean_state_name(value).casefold())
+
+
+def state_from_location(location):
+    """Finds a known state in a free-text location, or returns None."""
+    location = clean_state_name(location).casefold()
+    if not location:
+        return None
+    vocabulary = get_state_vocabulary()
+
+    # Addresses usually end with the state: check the comma-separated parts from the right.
+    for part in reversed(location.split(',')):
+        state = vocabulary.get(part.strip())
+        if state:
+            return state
+
+    # Otherwise look for a state as whole words anywhere, longest names first
+    # (so "Andhra Pradesh" wins over a shorter name it contains).
+    for key in sorted(vocabulary, key=len, reverse=True):
+        if re.search(rf'\b{re.escape(key)}\b', location):
+            return vocabulary[key]
+    return None
+
+
+def resolve_event_state(state, location):
+    """The value stored in Event.state: the canonical state, else one found in the location, else the input."""
+    return normalize_state(state) or state_from_location(location) or clean_state_name(state) or None
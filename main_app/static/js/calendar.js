@@ -1,7 +1,8 @@
 // calendar.js (Handles all event/filter data and calendar rendering, including hover tooltip)
 
 let currentDate = new Date();
-window.currentEventDates = {};
+currentDate.setDate(1); // Month navigation must not overflow from e.g. the 31st into the month after next
+window.currentEventDates = {}; // 'YYYY-MM-DD' -> number of events that day
 
 // GLOBAL FUNCTION: Collects filter parameters from the modal
 function getFilterParams() {
@@ -40,12 +41,16 @@ function getFilterParams() {
 
 // GLOBAL FUNCTION: Handles the filter API call and re-renders the calendar
 window.fetchEventDates = async () => {
-    const params = getFilterParams();
+    // Only the visible month is requested; the browser revalidates it with the ETag (304 if unchanged).
+    const params = new URLSearchParams(getFilterParams());
+    params.append('month', `${currentDate.getFullYear()}-${String(currentDate.getMonth() + 1).padStart(2, '0')}`);
     try {
-        const response = await fetch(`/calendar-events-api/?${params}`);
+        // Per-day counts only; a day's events are loaded when it is clicked
+        const response = await fetch(`/calendar-heatmap-api/?${params}`);
         const data = await response.json();
 
-        window.currentEventDates = data.events_by_date;
+        window.currentEventDates = data.days;
+        updateFacetCounts(data.facets || {});
         window.renderCalendar();
     } catch (error) {
         console.error('Error fetching filtered event dates:', error);
@@ -54,6 +59,23 @@ window.fetchEventDates = async () => {
     }
 };
 
+// Appends "(count)" to the filter dropdown options, e.g. "Hackathon (12)", from the API's facet counts
+function updateFacetCounts(facets) {
+    const dropdowns = [
+        [document.getElementById('event-category-filter'), facets.event_type || {}],
+        [document.getElementById('event-fees-filter'), facets.fees || {}],
+    ];
+
+    dropdowns.forEach(([select, counts]) => {
+        if (!select) return;
+        select.querySelectorAll('option').forEach(option => {
+            if (!option.value) return; // "All ..." option
+            if (option.dataset.label === undefined) option.dataset.label = option.textContent;
+            option.textContent = `${option.dataset.label} (${counts[option.value] || 0})`;
+        });
+    });
+}
+
 // GLOBAL FUNCTION: Logic for applying filters (called by the modal button in main.js)
 function applyFilters() {
     window.fetchEventDates();
@@ -123,17 +145,17 @@ document.addEventListener('DOMContentLoaded', function() {
                 day.classList.add('today');
             }
 
-            const eventsOnDay = window.currentEventDates[dateString];
+            const eventCount = window.currentEventDates[dateString] || 0;
 
-            if (eventsOnDay && eventsOnDay.length > 0) {
+            if (eventCount > 0) {
                 if (filtersActive) {
                     day.classList.add('filtered-event-day'); // Pink highlight
                 } else {
                     day.classList.add('event-day'); // Normal highlight
                 }
                 day.dataset.dateString = dateString;
-                // ADDED: Store event names for the tooltip
-                day.dataset.eventNames = eventsOnDay.map(e => e.name).join('; ');
+                // Store the event count for the tooltip
+                day.dataset.eventCount = eventCount;
             }
 
             calendarGrid.appendChild(day);
@@ -154,16 +176,24 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 
     // Calendar Day Click (opens daily events modal)
-    calendarGrid.addEventListener('click', (e) => {
+    calendarGrid.addEventListener('click', async (e) => {
         const targetDay = e.target.closest('.event-day, .filtered-event-day');
         if (targetDay) {
             const dateString = targetDay.dataset.dateString;
-            const eventsOnDay = window.currentEventDates[dateString];
+            const params = new URLSearchParams(getFilterParams());
+            params.append('format', 'json');
 
-            if (eventsOnDay && eventsOnDay.length > 0) {
-                renderDailyEvents(dateString, eventsOnDay);
-            } else {
-                window.location.href = `/events/create/`;
+            try {
+                const response = await fetch(`/events/day/${dateString}/?${params}`);
+                const data = await response.json();
+
+                if (data.events && data.events.length > 0) {
+                    renderDailyEvents(dateString, data.events);
+                } else {
+                    window.location.href = `/events/create/`;
+                }
+            } catch (error) {
+                console.error('Error fetching the events of the day:', error);
             }
         }
     });
@@ -175,7 +205,7 @@ document.addEventListener('DOMContentLoaded', function() {
         // Find the closest calendar day that has event data
         const targetDay = e.target.closest('.event-day, .filtered-event-day');
 
-        if (targetDay && targetDay.dataset.eventNames) {
+        if (targetDay && targetDay.dataset.eventCount) {
             // 1. Clear any existing tooltip
             if (currentTooltip) {
                 currentTooltip.remove();
@@ -185,9 +215,9 @@ document.addEventListener('DOMContentLoaded', function() {
             const tooltip = document.createElement('div');
             tooltip.classList.add('event-tooltip');
 
-            // Format the content as an unordered list
-            const eventNames = targetDay.dataset.eventNames.split('; ').map(name => `<li>${name}</li>`).join('');
-            tooltip.innerHTML = `<strong>Upcoming Events:</strong><ul>${eventNames}</ul>`;
+            // Show how many events the day has (details load on click)
+            const eventCount = Number(targetDay.dataset.eventCount);
+            tooltip.innerHTML = `<strong>Upcoming Events:</strong> ${eventCount} event${eventCount === 1 ? '' : 's'}`;
 
             // 3. Append the tooltip to the body for correct layering
             document.body.appendChild(tooltip);
@@ -278,39 +278,41 @@ document.addEventListener('DOMContentLoaded', function() {
     };
 
     // 5.1. Open Modal on Media Click
-    document.querySelectorAll('.media-gallery').forEach(gallery => {
-        gallery.addEventListener('click', (e) => {
-            const clickedItem = e.target.closest('.gallery-item, .gallery-plus-sign');
-
-            if (clickedItem) {
-                const mediaUrlsString = gallery.dataset.mediaUrls;
-                if (!mediaUrlsString) return;
-
-                // Safely parse the JSON string from the data attribute
-                try {
-                    currentMediaUrls = JSON.parse(mediaUrlsString);
-                } catch (error) {
-                    console.error('Error parsing media URLs:', error);
-                    return;
-                }
+    // Delegated from the document so galleries appended by the infinite scroll (section 6) work too.
+    document.addEventListener('click', (e) => {
+        const gallery = e.target.closest('.media-gallery');
+        if (!gallery) return;
+
+        const clickedItem = e.target.closest('.gallery-item, .gallery-plus-sign');
+
+        if (clickedItem) {
+            const mediaUrlsString = gallery.dataset.mediaUrls;
+            if (!mediaUrlsString) return;
+
+            // Safely parse the JSON string from the data attribute
+            try {
+                currentMediaUrls = JSON.parse(mediaUrlsString);
+            } catch (error) {
+                console.error('Error parsing media URLs:', error);
+                return;
+            }
 
-                // Determine the index of the clicked item (if it's one of the visible ones)
-                if (e.target.closest('.gallery-item')) {
-                    const galleryItems = gallery.querySelectorAll('.gallery-item');
-                    currentIndex = Array.from(galleryItems).indexOf(e.target.closest('.gallery-item'));
-                    // If the click was on the plus sign, just open to the first one (index 0)
-                } else if (e.target.closest('.gallery-plus-sign')) {
-                     currentIndex = 0; // Start at the beginning for plus sign click
-                }
+            // Determine the index of the clicked item (if it's one of the visible ones)
+            if (e.target.closest('.gallery-item')) {
+                const galleryItems = gallery.querySelectorAll('.gallery-item');
+                currentIndex = Array.from(galleryItems).indexOf(e.target.closest('.gallery-item'));
+                // If the click was on the plus sign, just open to the first one (index 0)
+            } else if (e.target.closest('.gallery-plus-sign')) {
+                 currentIndex = 0; // Start at the beginning for plus sign click
+            }
 
-                // Fallback to 0 if we somehow clicked something else or index is out of bounds
-                if (currentIndex === -1) currentIndex = 0;
+            // Fallback to 0 if we somehow clicked something else or index is out of bounds
+            if (currentIndex === -1) currentIndex = 0;
 
 
-                showCurrentMedia();
-                modal.style.display = 'flex'; // Use flex to help with centering modal content
-            }
-        });
+            showCurrentMedia();
+            modal.style.display = 'flex'; // Use flex to help with centering modal content
+        }
     });
 
     // 5.2. Close Modal
@@ -340,4 +342,58 @@ document.addEventListener('DOMContentLoaded', function() {
         currentIndex = (currentIndex < currentMediaUrls.length - 1) ? currentIndex + 1 : 0;
         showCurrentMedia();
     });
+
+
+    // =========================================================
+    // --- 6. INFINITE SCROLL FEED ---
+    // =========================================================
+    // The server renders only the first page of posts. When the sentinel below the
+    // feed scrolls into view, the next page is fetched with the cursor of the last one.
+    const feedSentinel = document.getElementById('feed-sentinel');
+    const postsList = document.querySelector('.posts-list');
+
+    if (feedSentinel && postsList && 'IntersectionObserver' in window) {
+        let isLoadingFeed = false;
+
+        const loadNextFeedPage = () => {
+            const nextCursor = feedSentinel.dataset.nextCursor;
+            if (isLoadingFeed || !nextCursor) return;
+            isLoadingFeed = true;
+
+            const feedUrl = new URL(feedSentinel.dataset.feedUrl, window.location.origin);
+            feedUrl.searchParams.set('cursor', nextCursor);
+
+            fetch(feedUrl)
+                .then(response => {
+                    if (!response.ok) throw new Error('Server error or network issue');
+                    return response.json();
+                })
+                .then(data => {
+                    postsList.insertAdjacentHTML('beforeend', data.html);
+
+                    if (data.next_cursor) {
+                        feedSentinel.dataset.nextCursor = data.next_cursor;
+                        // Re-observe so a sentinel that is still on screen triggers the next page
+                        feedObserver.unobserve(feedSentinel);
+                        feedObserver.observe(feedSentinel);
+                    } else {
+                        // Last page reached: stop observing and remove the spinner
+                        feedObserver.disconnect();
+                        feedSentinel.remove();
+                    }
+                })
+                .catch(error => console.error('Error fetching feed page:', error))
+                .finally(() => {
+                    isLoadingFeed = false;
+                });
+        };
+
+        const feedObserver = new IntersectionObserver((entries) => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadNextFeedPage();
+            }
+        }, { rootMargin: '400px 0px' });
+
+        feedObserver.observe(feedSentinel);
+    }
 });
\ No newline at end of file
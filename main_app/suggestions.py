@@ -0,0 +1,133 @@
+# main_app/suggestions.py
+"""
+"Suggested Colleges" recommendations.
+
+Instead of sorting the whole College table randomly on every page load,
+each user gets a short ranked list of candidate colleges precomputed from
+the Follow graph:
+
+* co-follow similarity: colleges followed by people who follow the same
+  colleges as the user (sampled from the most recent followers, so the
+  cost does not grow with popular colleges),
+* same state: colleges in the same College.state as the user's college.
+
+The list is stored in CollegeSuggestion, refreshed when the user's own
+follows or college change (and periodically by the
+refresh_college_suggestions command), and cached. Serving a page is a
+cache lookup plus random.sample over at most SUGGESTION_POOL_SIZE names.
+"""
+import random
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from .colleges import fold
+from .models import College, CollegeSuggestion, Follow, UserProfile
+
+
+# Number of ranked candidates stored per user; suggestions are sampled from these.
+SUGGESTION_POOL_SIZE = 30
+# Number of suggestions shown in the sidebar.
+SUGGESTIONS_SHOWN = 3
+# Most recent followers of the user's colleges used to find co-followed colleges.
+CO_FOLLOWER_SAMPLE_SIZE = 500
+# Score given to a college in the same state as the user's own college.
+SAME_STATE_SCORE = 1.0
+
+SUGGESTIONS_CACHE_KEY = 'suggestions:user:{}'
+SUGGESTIONS_CACHE_TIMEOUT = 60 * 60
+POPULAR_COLLEGES_CACHE_KEY = 'suggestions:popular'
+POPULAR_COLLEGES_CACHE_TIMEOUT = 60 * 60
+
+
+def _user_college_names(user):
+    followed = set(Follow.objects.filter(follower=user).values_list('college_name', flat=True))
+    own_college = UserProfile.objects.filter(user=user).values_list('college_name', flat=True).first()
+    return own_college, followed | ({own_college} if own_college else set())
+
+
+def compute_suggestions(user):
+    """Returns [(college_name, score), ...] for the user, best first."""
+    own_college, excluded = _user_college_names(user)
+    scores = {}
+
+    # 1. Co-follow similarity: what do people with the same follows also follow?
+    co_followers = Follow.objects.filter(college_name__in=excluded).exclude(
+        follower=user
+    ).order_by('-created_at').values('follower_id')[:CO_FOLLOWER_SAMPLE_SIZE]
+
+    co_followed = Follow.objects.filter(follower_id__in=co_followers).exclude(
+        college_name__in=excluded
+    ).values('college_name').annotate(total=Count('id')).order_by('-total')[:SUGGESTION_POOL_SIZE]
+
+    for row in co_followed:
+        scores[row['college_name']] = float(row['total'])
+
+    # 2. Colleges in the same state as the user's own college.
+    own_state = College.objects.filter(
+        name_key=fold(own_college)
+    ).values_list('state', flat=True).first() if own_college else None
+    if own_state:
+        same_state = College.objects.filter(state=own_state).exclude(
+            name__in=excluded
+        ).values_list('name', flat=True)[:SUGGESTION_POOL_SIZE]
+        for name in same_state:
+            scores[name] = scores.get(name, 0.0) + SAME_STATE_SCORE
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return ranked[:SUGGESTION_POOL_SIZE]
+
+
+def refresh_suggestions(user):
+    """Recomputes and stores the user's ranked suggestion pool."""
+    ranked = compute_suggestions(user)
+    # Matched on the indexed name_key, so follows stored with another spelling still resolve
+    names_by_key = {fold(name): name for name, _ in ranked}
+    college_ids = {
+        names_by_key[key]: college_id
+        for key, college_id in College.objects.filter(name_key__in=names_by_key).values_list('name_key', 'id')
+    }
+
+    CollegeSuggestion.objects.filter(user=user).delete()
+    CollegeSuggestion.objects.bulk_create([
+        CollegeSuggestion(user=user, college_id=college_ids[name], score=score)
+        for name, score in ranked if name in college_ids
+    ])
+    cache.delete(SUGGESTIONS_CACHE_KEY.format(user.pk))
+    return len(college_ids)
+
+
+def get_popular_colleges():
+    """Most followed colleges, used when a user has no precomputed suggestions yet."""
+    names = cache.get(POPULAR_COLLEGES_CACHE_KEY)
+    if names is None:
+        names = list(
+            Follow.objects.values('college_name').annotate(total=Count('id'))
+            .order_by('-total').values_list('college_name', flat=True)[:SUGGESTION_POOL_SIZE]
+        )
+        if not names:
+            names = list(College.objects.values_list('name', flat=True)[:SUGGESTION_POOL_SIZE])
+        cache.set(POPULAR_COLLEGES_CACHE_KEY, names, POPULAR_COLLEGES_CACHE_TIMEOUT)
+    return names
+
+
+def get_suggestion_pool(user):
+    """The user's ranked candidate college names (cached)."""
+    cache_key = SUGGESTIONS_CACHE_KEY.format(user.pk)
+    pool = cache.get(cache_key)
+    if pool is None:
+        pool = list(
+            CollegeSuggestion.objects.filter(user=user).order_by('-score')
+            .values_list('college__name', flat=True)[:SUGGESTION_POOL_SIZE]
+        )
+        cache.set(cache_key, pool, SUGGESTIONS_CACHE_TIMEOUT)
+    return pool
+
+
+def get_suggested_colleges(user, count=SUGGESTIONS_SHOWN):
+    """Returns a random sample of the user's suggested college names."""
+    pool = get_suggestion_pool(user) if user.is_authenticated else []
+    if not pool:
+        _, excluded = _user_college_names(user) if user.is_authenticated else (None, set())
+        pool = [name for name in get_popular_colleges() if name not in excluded]
+    return random.sample(pool, min(count, len(pool)))
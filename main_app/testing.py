@@ -0,0 +1,62 @@
+# main_app/testing.py
+"""
+Test helpers for the query budgets enforced by QueryBudgetMiddleware.
+
+    class ViewQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+        url_kwargs = {'college_community': {'college_name': 'Some College'}, ...}
+
+        def test_every_url_stays_within_budget(self):
+            self.client.force_login(self.user)
+            self.assertUrlQueryBudgets()
+"""
+from django.conf import settings
+from django.db import connection
+from django.urls import URLPattern, reverse
+
+from . import urls as main_app_urls
+from .middleware import QueryRecorder, get_query_budget
+
+
+class QueryBudgetTestMixin:
+    """Mixin for django.test.TestCase that asserts per-URL query counts."""
+
+    # URL name -> kwargs used to reverse patterns that take arguments.
+    url_kwargs = {}
+    # URL name -> query parameters sent with the GET (e.g. APIs that take their arguments there).
+    url_query = {}
+    # URL names that should not be requested (e.g. external redirects).
+    skip_url_names = set()
+
+    def assertQueryBudget(self, url_name, budget=None, query=None, **kwargs):
+        """GETs the named URL (with the `query` parameters) and asserts its query count and N+1 shapes."""
+        budget = get_query_budget(url_name) if budget is None else budget
+        url = reverse(url_name, kwargs=kwargs or None)
+
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.client.get(url, query)
+            if response.streaming:
+                # A streamed body (JSON events, CSV export) runs its queries while it is read.
+                body = b''.join(response.streaming_content)
+                response.streaming_content = [body]
+
+        self.assertLessEqual(
+            recorder.count, budget,
+            f"{url} ({url_name}) ran {recorder.count} queries, budget is {budget}:\n"
+            + '\n'.join(f"{total}x {sql}" for sql, total in recorder.shapes.most_common())
+        )
+        repeated = recorder.repeated_shapes(settings.QUERY_BUDGET_REPEATED_QUERY_LIMIT)
+        self.assertFalse(repeated, f"{url} ({url_name}) repeats queries (N+1): {repeated}")
+        return response
+
+    def assertUrlQueryBudgets(self):
+        """Runs assertQueryBudget for every named URL in main_app/urls.py."""
+        for pattern in main_app_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name or pattern.name in self.skip_url_names:
+                continue
+            if pattern.pattern.converters and pattern.name not in self.url_kwargs:
+                self.fail(f"url_kwargs has no arguments for the '{pattern.name}' URL.")
+
+            with self.subTest(url_name=pattern.name):
+                self.assertQueryBudget(pattern.name, query=self.url_query.get(pattern.name),
+                                       **self.url_kwargs.get(pattern.name, {}))
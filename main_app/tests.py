@@ -1,3 +1,351 @@
-from django.test import TestCase
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import models
+from .applications import apply_to_event, APPLIED, ALREADY_APPLIED, EVENT_FULL
+from .colleges import autocomplete_colleges, fold
+from .facets import parse_event_filters, search_events
+from .feed import GENERAL_POSTS_LIMIT, get_home_feed_page
+from .models import (College, Event, EventApplicationDetails, EventCategory, EventRegistrationCounter, EventType,
+                     Follow, MediaFile, Post, TimelineEntry)
+from .registrations import stream_registrations_csv
+from .testing import QueryBudgetTestMixin
+
+
+class RegistrationRushTests(TransactionTestCase):
+    """Hundreds of parallel applications (see main_app/applications.py)."""
+
+    APPLICANTS = 300
+    CAPACITY = 200
+    # The in-memory SQLite test database locks whole tables without waiting (apply_to_event
+    # retries those conflicts); fewer threads keep the rush within its retries there.
+    WORKERS = 4 if connection.vendor == 'sqlite' else 16
+
+    def setUp(self):
+        self.organizer = User.objects.create_user('organizer', 'organizer@example.com', 'password')
+        self.applicants = User.objects.bulk_create([
+            User(username=f'applicant{i}', email=f'applicant{i}@example.com') for i in range(self.APPLICANTS)
+        ])
+
+    def _rush(self, event, users):
+        def apply(user):
+            try:
+                application = EventApplicationDetails(name=user.username, college_name='Test College',
+                                                      email_id=user.email)
+                return apply_to_event(event, user, application)
+            finally:
+                # Each worker thread has its own connection.
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as pool:
+            # list() re-raises the first exception of any application.
+            return Counter(pool.map(apply, users))
+
+    def test_rush_without_capacity(self):
+        event = Event.objects.create(event_name='Open Rush', location='Main Hall', date_time=timezone.now(),
+                                     organizer=self.organizer)
+
+        results = self._rush(event, self.applicants)
+
+        self.assertEqual(results, {APPLIED: self.APPLICANTS})
+        self.assertEqual(EventApplicationDetails.objects.filter(event=event).count(), self.APPLICANTS)
+        self.assertEqual(EventRegistrationCounter.objects.get(event=event).registered_count, self.APPLICANTS)
+
+    def test_rush_with_capacity_and_duplicates(self):
+        event = Event.objects.create(event_name='Limited Rush', location='Main Hall', date_time=timezone.now(),
+                                     organizer=self.organizer, capacity=self.CAPACITY)
+
+        # Every applicant submits twice.
+        results = self._rush(event, self.applicants * 2)
+
+        self.assertEqual(results[APPLIED], self.CAPACITY)
+        self.assertEqual(results[APPLIED] + results[ALREADY_APPLIED] + results[EVENT_FULL], 2 * self.APPLICANTS)
+        self.assertEqual(EventApplicationDetails.objects.filter(event=event).count(), self.CAPACITY)
+        self.assertEqual(EventRegistrationCounter.objects.get(event=event).registered_count, self.CAPACITY)
+
+
+class CollegeAutocompleteTests(TestCase):
+    """Ranking and reloading of the in-process college index (see main_app/colleges.py)."""
+
+    def setUp(self):
+        # A fresh index version, so no index loaded by another test is reused.
+        cache.clear()
+
+    def _names(self, query, **kwargs):
+        return [college['name'] for college in autocomplete_colleges(query, **kwargs)]
+
+    def _create_colleges(self, names):
+        # bulk_create skips College.save; the index is loaded after the rows exist.
+        College.objects.bulk_create([College(name=name, name_key=fold(name), state='Test') for name in names])
+
+    def test_name_prefix_matches_rank_before_word_matches(self):
+        self._create_colleges([
+            'Indian Institute of Technology Bombay',
+            'Indore Engineering College',
+            'Central Institute of Indology',
+            'Mumbai University',
+        ])
+
+        # Names starting with the query (shortest first), then names with a word starting with it.
+        self.assertEqual(self._names('ind'), [
+            'Indore Engineering College', 'Indian Institute of Technology Bombay', 'Central Institute of Indology',
+        ])
+        # Every term must start a word of the name.
+        self.assertEqual(self._names('tech ind'), ['Indian Institute of Technology Bombay'])
+        # Misspelt queries fall back to near matches.
+        self.assertEqual(self._names('Mumbay Universty'), ['Mumbai University'])
+
+    def test_one_result_per_college_when_several_words_match(self):
+        # Three words of every name start with "in"; with 300 colleges the prefix is a precomputed hot prefix.
+        for total in (5, 300):
+            with self.subTest(colleges=total):
+                College.objects.all().delete()
+                self._create_colleges([f'College {i:03d} Institute of Information Innovation' for i in range(total)])
+                cache.clear()
+
+                results = autocomplete_colleges('in')
+
+                self.assertEqual([college['name'] for college in results], [
+                    f'College {i:03d} Institute of Information Innovation' for i in range(min(total, 10))
+                ])
+
+    def test_index_reloads_after_college_save(self):
+        self.assertEqual(self._names('zen'), [])
+
+        college = College.objects.create(name='Zenith College', state='Goa')
+        self.assertEqual(self._names('zen'), ['Zenith College'])
+
+        college.name = 'Apex College'
+        college.save()
+        self.assertEqual(self._names('zen'), [])
+        self.assertEqual(self._names('apex'), ['Apex College'])
+
+        college.delete()
+        self.assertEqual(self._names('apex'), [])
+
+
+class EventFacetTests(TestCase):
+    """Matching ids and disjunctive facet counts of search_events (see main_app/facets.py)."""
+
+    def setUp(self):
+        cache.clear()
+        self.alice = self._member('alice@example.com', 'College A')
+        self.bob = self._member('bob@example.com', 'College B')
+        category = EventCategory.objects.create(name='Technical')
+        self.hackathon = EventType.objects.create(category=category, name='Hackathon')
+        self.workshop = EventType.objects.create(category=category, name='Workshop')
+
+        self.free_hackathon = self._event(1, self.hackathon, None, 'Karnataka', self.alice)
+        self.paid_hackathon = self._event(2, self.hackathon, 100, 'Karnataka', self.alice)
+        self.kerala_hackathon = self._event(3, self.hackathon, None, 'Kerala', self.bob)
+        self.free_workshop = self._event(4, self.workshop, None, 'Karnataka', self.bob)
+        self.bob_hackathon = self._event(5, self.hackathon, None, 'Karnataka', self.bob)
+        # Already over: never matched.
+        self.past_hackathon = self._event(-2, self.hackathon, None, 'Karnataka', self.alice)
+
+    def _member(self, email, college_name):
+        user = User.objects.create_user(email, email, 'password')
+        profile = user.userprofile
+        profile.college_name = college_name
+        profile.save()
+        return user
+
+    def _event(self, days, event_type, fees, state, organizer):
+        return Event.objects.create(event_name=f'{event_type.name} {days}', event_type=event_type,
+                                    registration_fees=fees, state=state, location='Main Hall',
+                                    date_time=timezone.now() + timedelta(days=days), organizer=organizer)
+
+    def _filters(self, **params):
+        return parse_event_filters({key: str(value) for key, value in params.items()})
+
+    def test_combined_filters(self):
+        ids, counts = search_events(self._filters(event_type=self.hackathon.pk, fees='free', state='karnataka'))
+
+        self.assertEqual(ids, [self.free_hackathon.pk, self.bob_hackathon.pk])
+        # Each facet is counted with every other active filter applied.
+        self.assertEqual(counts['event_type'], {self.hackathon.pk: 2, self.workshop.pk: 1})
+        self.assertEqual(counts['fees'], {'free': 2, 'paid': 1})
+        self.assertEqual(counts['state'], {'Karnataka': 2, 'Kerala': 1})
+        self.assertEqual(counts['college'], {'College A': 1, 'College B': 1})
+
+    def test_my_college_only(self):
+        ids, counts = search_events(self._filters(event_type=self.hackathon.pk, my_college_only='true'), self.alice)
+
+        self.assertEqual(ids, [self.free_hackathon.pk, self.paid_hackathon.pk])
+        self.assertEqual(counts['fees'], {'free': 1, 'paid': 1})
+        self.assertEqual(counts['event_type'], {self.hackathon.pk: 2})
+
+    def test_applied_only(self):
+        for event in (self.paid_hackathon, self.free_workshop, self.past_hackathon):
+            apply_to_event(event, self.bob, EventApplicationDetails(name='Bob', college_name='College B',
+                                                                    email_id=self.bob.email))
+
+        ids, counts = search_events(self._filters(applied_filter='true'), self.bob)
+
+        self.assertEqual(ids, [self.paid_hackathon.pk, self.free_workshop.pk])
+        self.assertEqual(counts['event_type'], {self.hackathon.pk: 1, self.workshop.pk: 1})
+        self.assertEqual(counts['college'], {'College A': 1, 'College B': 1})
+
+
+class HomeFeedPaginationTests(TestCase):
+    """Walking every page of the home feed (see main_app/feed.py) returns each post once, in order."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = self._member('reader@example.com', 'College A')
+        Follow.objects.create(follower=self.user, college_name='College B')
+        self.authors = [self.user] + [
+            self._member(f'{college[-1].lower()}@example.com', college)
+            for college in ('College A', 'College B', 'College C', 'College D')
+        ]
+        self._create_posts(45)
+
+    def _member(self, email, college_name):
+        user = User.objects.create_user(email, email, 'password')
+        profile = user.userprofile
+        profile.college_name = college_name
+        profile.save()
+        return user
+
+    def _create_posts(self, total):
+        posts = [Post.objects.create(author=self.authors[i % len(self.authors)], post_text=f'Post {i}')
+                 for i in range(total)]
+        # Groups of three posts share a timestamp, so the id breaks the ties.
+        for group in range(0, total, 3):
+            created_at = timezone.now() + timedelta(minutes=group)
+            post_ids = [post.pk for post in posts[group:group + 3]]
+            Post.objects.filter(pk__in=post_ids).update(created_at=created_at)
+            TimelineEntry.objects.filter(post_id__in=post_ids).update(created_at=created_at)
+
+    def _expected_feed(self):
+        ordered = list(Post.objects.order_by('-created_at', '-id').values_list('id', 'college_name'))
+        general = [post_id for post_id, college in ordered if college not in ('College A', 'College B')]
+        shown = {post_id for post_id, college in ordered if college in ('College A', 'College B')}
+        shown.update(general[:GENERAL_POSTS_LIMIT])
+        return [post_id for post_id, _ in ordered if post_id in shown]
+
+    def _walk(self, page_size):
+        post_ids, cursor = [], None
+        while True:
+            posts, cursor = get_home_feed_page(self.user, cursor=cursor, page_size=page_size)
+            self.assertLessEqual(len(posts), page_size)
+            post_ids += [post.pk for post in posts]
+            if cursor is None:
+                return post_ids
+
+    def _assert_every_page(self):
+        expected = self._expected_feed()
+        for page_size in (10, 7):
+            with self.subTest(page_size=page_size):
+                post_ids = self._walk(page_size)
+                # No duplicates, no gaps, (-created_at, -id) order.
+                self.assertEqual(post_ids, expected)
+
+    def test_pages_from_timelines(self):
+        self.assertTrue(TimelineEntry.objects.filter(user=self.user).exists())
+        self._assert_every_page()
+
+    @override_settings(FEED_FANOUT_LIMIT=1)
+    def test_pages_from_high_fanout_colleges(self):
+        # Every college is now read on demand, both for posts already in the timeline and for new ones.
+        cache.clear()
+        self._create_posts(20)
+        self._assert_every_page()
+
+
+class EventSlugTests(TestCase):
+    """Event.save retries when a concurrent save takes the generated slug first."""
+
+    def test_retries_with_the_next_suffix(self):
+        organizer = User.objects.create_user('organizer', 'organizer@example.com', 'password')
+        first = Event.objects.create(event_name='Hackathon', location='Main Hall', date_time=timezone.now(),
+                                     organizer=organizer)
+        real_unique_event_slug = models.unique_event_slug
+
+        # The first lookup runs as if `first` had not been committed yet.
+        with mock.patch.object(models, 'unique_event_slug',
+                               side_effect=['hackathon', real_unique_event_slug('Hackathon')]):
+            second = Event.objects.create(event_name='Hackathon', location='Main Hall', date_time=timezone.now(),
+                                          organizer=organizer)
+
+        self.assertEqual((first.slug, second.slug), ('hackathon', 'hackathon-2'))
+        self.assertEqual(Event.objects.count(), 2)
+
+
+class RegistrationExportTests(TestCase):
+    """Exported registrations are not evaluated as formulas by spreadsheets."""
+
+    def test_formula_prefixes_are_quoted(self):
+        organizer = User.objects.create_user('organizer', 'organizer@example.com', 'password')
+        event = Event.objects.create(event_name='Export', location='Main Hall', date_time=timezone.now(),
+                                     organizer=organizer)
+        EventApplicationDetails.objects.create(event=event, user=organizer, name='=HYPERLINK("http://x")',
+                                               college_name='@SUM(A1)', email_id='a@example.com',
+                                               whatsapp_number='+911234567890')
+
+        lines = list(stream_registrations_csv(event))
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('"\'=HYPERLINK(""http://x"")",\'@SUM(A1),a@example.com,\'+911234567890,'))
+
+
+class ViewQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """Every page and API of main_app/urls.py stays within its query budget (see main_app/testing.py)."""
+
+    # External redirect (Google sign-in) and logging out the test user.
+    skip_url_names = {'social_login_start', 'logout'}
+
+    def setUp(self):
+        cache.clear()
+        self.user = self._member('member@example.com', 'Test College')
+        other = self._member('other@example.com', 'Other College')
+        College.objects.create(name='Test College', state='Karnataka')
+        College.objects.create(name='Other College', state='Kerala')
+        Follow.objects.create(follower=self.user, college_name='Other College')
+
+        category = EventCategory.objects.create(name='Technical')
+        event_type = EventType.objects.create(category=category, name='Hackathon')
+        self.event = Event.objects.create(event_name='Spring Hackathon', event_type=event_type, location='Main Hall',
+                                          date_time=timezone.now() + timedelta(days=2), organizer=self.user)
+        apply_to_event(self.event, other, EventApplicationDetails(name='Other', college_name='Other College',
+                                                                  email_id=other.email))
+
+        # Enough posts with media for an N+1 in the feeds to show up as repeated queries.
+        for i in range(8):
+            post = Post.objects.create(author=other if i % 2 else self.user, post_text=f'Post {i}')
+            MediaFile.objects.create(post=post, file='post_media/photo.jpg')
+
+        self.url_kwargs = {
+            'college_community': {'college_name': 'Other College'},
+            'apply_for_event': {'event_link_key': self.event.event_link_key},
+            'withdraw_application': {'event_link_key': self.event.event_link_key},
+            'event_details': {'event_title': self.event.slug},
+            'registrations_view': {'event_id': self.event.pk},
+            'export_registrations': {'event_id': self.event.pk},
+            'registration_series_api': {'event_id': self.event.pk},
+            'daily_events': {'date_str': timezone.localdate(self.event.date_time).isoformat()},
+            'event_detail': {'event_link_key': self.event.event_link_key},
+        }
+        self.url_query = {
+            'college_feed_api': {'college': 'Other College'},
+        }
+
+    def _member(self, email, college_name):
+        user = User.objects.create_user(email, email, 'password')
+        profile = user.userprofile
+        profile.college_name = college_name
+        profile.setup_complete = True
+        profile.save()
+        return user
+
+    def test_every_url_stays_within_budget(self):
+        self.client.force_login(self.user)
+        self.assertUrlQueryBudgets()
@@ -27,21 +27,29 @@ urlpatterns = [
 
     # ------------------ Dashboard & Content Views (Keep these intact) -------------------
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('api/feed/', views.feed_api, name='feed_api'),
     path('profile/', views.profile_view, name='profile'),
     path('community/', views.my_community_view, name='my_community'),
     path('college-community/<str:college_name>/', views.college_community_view, name='college_community'),
+    path('api/feed/college/', views.college_feed_api, name='college_feed_api'),
 
     # ... (rest of the event, post, and API paths remain below) ...
     path('create-post/', views.create_post, name='create_post'),
     path('events/create/', views.create_event, name='create_event'),
     path('apply/<uuid:event_link_key>/', views.apply_for_event, name='apply_for_event'),
+    path('apply/<uuid:event_link_key>/withdraw/', views.withdraw_application_view, name='withdraw_application'),
+    # Before events/<str:event_title>/, which would otherwise swallow it.
+    path('events/filter/', views.filter_events_api, name='filter_events_api'),
     path('events/<str:event_title>/', views.event_details, name='event_details'),
     path('event-log/', views.event_log_view, name='event_log'),
     path('registrations/<int:event_id>/', views.registrations_view, name='registrations_view'),
+    path('registrations/<int:event_id>/export/', views.export_registrations, name='export_registrations'),
+    path('registrations/<int:event_id>/series/', views.registration_series_api, name='registration_series_api'),
     path('my-applications/', views.my_applications_view, name='my_applications'),
     path('api/events/', views.get_events, name='get_events'),
-    path('events/filter/', views.filter_events_api, name='filter_events_api'),
+    path('api/events/search/', views.event_search_api, name='event_search_api'),
     path('calendar-events-api/', views.calendar_events_api, name='calendar_events_api'),
+    path('calendar-heatmap-api/', views.calendar_heatmap_api, name='calendar_heatmap_api'),
     path('events/day/<str:date_str>/', views.daily_events_view, name='daily_events'),
     path('college-autocomplete/', views.college_autocomplete, name='college_autocomplete'),
     path('api/state-autocomplete/', views.state_autocomplete, name='state_autocomplete'),
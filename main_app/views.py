@@ -1,28 +1,45 @@
 import requests
 from django.contrib.auth.models import User
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth import login, logout
 from django.utils import timezone
+from django.utils.http import urlencode
 from django.contrib import messages
 from django.db import IntegrityError
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.template.loader import render_to_string
 from django.db.models import Q, F  # Ensure F is imported at the top of your views.py
-from .models import Event, Post, UserProfile, MediaFile, EventApplicationDetails, Follow, College, EventCategory, \
-    EventType, ChatMessage
+from .models import Event, Post, UserProfile, MediaFile, EventApplicationDetails, Follow, ChatMessage
 from .forms import UserRegistrationForm, PostForm, EventCreationForm, EventApplicationForm, UserUpdateForm, UserProfileUpdateForm
-from datetime import datetime
-from django.views.decorators.http import require_POST
+from datetime import datetime, timedelta
+from django.views.decorators.http import require_POST, condition
+from django.views.decorators.cache import cache_control
 from .forms import MandatoryProfileForm
-from .models import UserProfile, College
 from .models import Event
 from .decorators import profile_setup_required
-from django.http import HttpResponse, Http404
+from .feed import get_home_feed_page, get_college_feed_page, rebuild_timeline, InvalidCursor
+from .community import get_college_stats
+from .sidebar import get_sidebar_context, get_categories_with_types
+from .suggestions import refresh_suggestions
+from .facets import parse_event_filters, search_events, get_calendar_heatmap
+from .search import search_event_ids
+from .applications import apply_to_event, withdraw_application, get_registration_series, APPLIED, EVENT_FULL
+from .colleges import autocomplete_colleges, get_college_by_name
+from .states import autocomplete_states
+from .registrations import (get_registrations_page, stream_registrations_csv, write_registrations_xlsx,
+                            xlsx_export_available, EXPORT_XLSX_MEMORY_LIMIT)
+from .events import (get_events_version, get_events_last_modified, get_month_window, stream_events_json,
+                     event_page_cache_key, EVENT_PAGE_CACHE_TIMEOUT)
+from django.http import HttpResponse, Http404, StreamingHttpResponse, FileResponse
 from django.views.decorators.csrf import csrf_exempt
+import hashlib
 import json
+import tempfile
 from django.conf import settings
+from django.core.cache import cache
 from .models import Post, MediaFile # Ensure these are imported from .models
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
@@ -90,73 +107,41 @@ def dashboard(request):
     # NOTE: The manual profile check and modal instantiation has been removed.
     # We now assume the profile is complete if this function runs.
 
-    # 1. Get the list of college names the user is following via the Follow model
-    followed_college_names = list(Follow.objects.filter(follower=user).values_list('college_name', flat=True))
-
-    # 2. Get the user's own college name (This ensures posts from their college are always seen)
-    # We must assume user_profile exists because of the @profile_setup_required decorator
-    user_college_name = user.userprofile.college_name
-
-    # Add the user's own college to the filter list if it's not already there (it might be followed explicitly)
-    if user_college_name and user_college_name not in followed_college_names:
-        followed_college_names.append(user_college_name)
-
-    # 3. Filter Posts: Show followed posts plus recent general activity (CLEANED LOGIC)
-
-    # Base query: Posts where the author's college name is IN the list of followed colleges
-    followed_posts_query = Post.objects.select_related('author__userprofile').prefetch_related(
-        'media_files').filter(
-        Q(author__userprofile__college_name__in=followed_college_names)
-    )
-
-    # Get a few recent posts that are NOT from the followed list
-    general_posts_query = Post.objects.select_related('author__userprofile').prefetch_related(
-        'media_files').exclude(
-        Q(author__userprofile__college_name__in=followed_college_names)
-    ).order_by('-created_at')[:10]  # Limit to 10 recent general posts
-
-    # Combine the query results.
-    posts_list = list(followed_posts_query) + list(general_posts_query)
-
-    # Sort the final combined list by creation date in reverse order
-    posts_list.sort(key=lambda post: post.created_at, reverse=True)
-
-    # FIX: Add select_related('organizer') to fetch the organizer's User object (which contains the email)
-    upcoming_events = Event.objects.filter(date_time__gte=timezone.now()).select_related('event_type',
-                                                                                         'organizer').order_by(
-        'date_time')
-
-    # --- Sidebar Data ---
-    # Fetch the suggested colleges needed for the right sidebar
-    try:
-        suggested_colleges = list(College.objects.all().order_by('?')[:3])
-    except:
-        suggested_colleges = []
-
-    # Fetch all categories and their related event types for the filter dropdowns
-    event_categories = EventCategory.objects.all().order_by('name')
-    categories_with_types = []
-    for category in event_categories:
-        types = EventType.objects.filter(category=category).order_by('name')
-        categories_with_types.append({
-            'category': category,
-            'types': types,
-        })
-    # --- END Sidebar Data ---
+    # 1. Load only the first page of the feed (followed colleges + recent general posts).
+    # Further pages are fetched by the infinite scroll in main.js through feed_api.
+    posts_list, next_cursor = get_home_feed_page(user)
 
     # Ensure posts_list is passed in the context
     context = {
         'posts_list': posts_list,
-        'upcoming_events': upcoming_events,
-        'suggested_colleges': suggested_colleges,
-        'categories_with_types': categories_with_types,
+        'next_cursor': next_cursor,
+        'feed_url': reverse('feed_api'),
 
         # The NEW CONTEXT for the modal is removed, as it's no longer needed here.
     }
+    # Sidebar data (upcoming events, suggested colleges, event filter taxonomy)
+    context.update(get_sidebar_context(request.user))
 
     return render(request, 'main_app/dashboard.html', context)
 
 
+@login_required
+@profile_setup_required
+def feed_api(request):
+    """
+    Returns the next page of the home feed as rendered post cards.
+    The cursor comes from the previous page, so each call reads a single page.
+    """
+    try:
+        posts_list, next_cursor = get_home_feed_page(request.user, cursor=request.GET.get('cursor'))
+    except InvalidCursor:
+        return JsonResponse({'status': 'error', 'message': 'Invalid cursor.'}, status=400)
+
+    html_content = render_to_string('includes/post_cards.html', {'posts_list': posts_list}, request=request)
+
+    return JsonResponse({'html': html_content, 'next_cursor': next_cursor})
+
+
 
 
 @login_required
@@ -165,14 +150,7 @@ def create_event(request):
     initial_data = {}
 
     # --- 1. DEFINE CATEGORIES EARLY (Fixes NameError) ---
-    event_categories = EventCategory.objects.all().order_by('name')
-    categories_with_types = []
-    for category in event_categories:
-        types = EventType.objects.filter(category=category).order_by('name')
-        categories_with_types.append({
-            'category': category,
-            'types': types,
-        })
+    categories_with_types = get_categories_with_types()
     # --- END CATEGORIES DEFINITION ---
 
     # --- 2. STATE AUTOFILL LOGIC (Robust String Extraction) ---
@@ -212,16 +190,59 @@ def create_event(request):
     return render(request, 'main_app/create_event.html', {'form': form, 'categories_with_types': categories_with_types})
 
 def get_events(request):
-    events = Event.objects.all()
-    event_list = []
-    for event in events:
-        formatted_date = event.date_time.strftime('%Y-%m-%d')
-        event_list.append({
-            'date': formatted_date,
-            'title': event.event_name,
-            'summary': f"{event.event_name}, Location: {event.location}, Fees: {event.registration_fees}",
-        })
-    return JsonResponse(event_list, safe=False)
+    """
+    Public events feed. Optional filters: ?start=YYYY-MM-DD and ?end=YYYY-MM-DD
+    (inclusive days) and ?limit=N. The JSON array is streamed row by row.
+    """
+    events_queryset = Event.objects.order_by('date_time', 'id')
+    try:
+        # Plain datetime bounds (not __date) so the date_time column can be range-scanned.
+        if request.GET.get('start'):
+            start = timezone.make_aware(datetime.strptime(request.GET['start'], '%Y-%m-%d'))
+            events_queryset = events_queryset.filter(date_time__gte=start)
+        if request.GET.get('end'):
+            end = timezone.make_aware(datetime.strptime(request.GET['end'], '%Y-%m-%d'))
+            events_queryset = events_queryset.filter(date_time__lt=end + timedelta(days=1))
+        if request.GET.get('limit'):
+            limit = int(request.GET['limit'])
+            if limit < 1:
+                raise ValueError
+            events_queryset = events_queryset[:limit]
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid start, end or limit.'}, status=400)
+
+    return StreamingHttpResponse(stream_events_json(events_queryset), content_type='application/json')
+
+
+def event_search_api(request):
+    """Full-text event search: ?q=terms (prefix-matched, all required), optional ?limit= (max 50)."""
+    try:
+        limit = min(int(request.GET.get('limit', 20)), 50)
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid limit.'}, status=400)
+
+    event_ids = search_event_ids(request.GET.get('q', ''), limit=limit)
+    events_by_id = {
+        event['id']: event
+        for event in Event.objects.filter(id__in=event_ids).values(
+            'id', 'event_name', 'event_link_key', 'location', 'date_time', event_type_name=F('event_type__name')
+        )
+    }
+
+    results = [
+        {
+            'name': event['event_name'],
+            'link_key': str(event['event_link_key']),
+            'location': event['location'],
+            'type_name': event['event_type_name'],
+            'date_time': event['date_time'].isoformat(sep=' ', timespec='minutes')[:16],
+        }
+        # Keep the ranking order of the search index.
+        for event in (events_by_id.get(event_id) for event_id in event_ids) if event
+    ]
+    return JsonResponse({'results': results})
 
 
 @login_required
@@ -230,14 +251,13 @@ def apply_for_event(request, event_link_key):
     if request.method == 'POST':
         form = EventApplicationForm(request.POST)
         if form.is_valid():
-            if EventApplicationDetails.objects.filter(user=request.user, event=event).exists():
-                messages.error(request, 'You have already applied for this event.')
-            else:
-                application = form.save(commit=False)
-                application.user = request.user
-                application.event = event
-                application.save()
+            status = apply_to_event(event, request.user, form.save(commit=False))
+            if status == APPLIED:
                 messages.success(request, f'You have successfully applied for {event.event_name}!')
+            elif status == EVENT_FULL:
+                messages.error(request, f'Sorry, {event.event_name} is full.')
+            else:
+                messages.error(request, 'You have already applied for this event.')
             return redirect('dashboard')
     else:
         initial_data = {}
@@ -261,13 +281,16 @@ def apply_for_event(request, event_link_key):
 
 
 def event_details(request, event_title):
-    event = Event.objects.filter(event_name=event_title).first()
+    event = Event.objects.filter(slug=event_title).first()
+    if event is None:
+        # Links shared before events had slugs carry the event name.
+        event = Event.objects.filter(event_name=event_title).order_by('id').first()
+        if event is None:
+            raise Http404("Event does not exist")
+        return redirect('event_details', event_title=event.slug, permanent=True)
 
-    if event:
-        apply_form = EventApplicationForm()
-        return render(request, 'main_app/event_details.html', {'event': event, 'apply_form': apply_form})
-    else:
-        raise Http404("Event does not exist")
+    apply_form = EventApplicationForm()
+    return render(request, 'main_app/event_details.html', {'event': event, 'apply_form': apply_form})
 
 
 @login_required
@@ -276,31 +299,18 @@ def my_community_view(request):
     if hasattr(user, 'userprofile'):
         user_college = user.userprofile.college_name
 
-        community_posts = Post.objects.filter(author__userprofile__college_name=user_college).order_by('-created_at')
-
-        # New code to fetch upcoming events and suggested colleges
-        upcoming_events = Event.objects.filter(date_time__gte=timezone.now()).select_related('event_type',
-                                                                                             'organizer').order_by(
-            'date_time')
-        suggested_colleges = list(College.objects.all().order_by('?')[:3])
-
-        # Fetch categories/types for event filters (likely needed for the community view's sidebar too)
-        event_categories = EventCategory.objects.all().order_by('name')
-        categories_with_types = []
-        for category in event_categories:
-            types = EventType.objects.filter(category=category).order_by('name')
-            categories_with_types.append({
-                'category': category,
-                'types': types,
-            })
+        # First page only; the rest is loaded on scroll through college_feed_api
+        community_posts, next_cursor = get_college_feed_page(user_college)
 
         context = {
             'posts_list': community_posts,
+            'next_cursor': next_cursor,
+            'feed_url': college_feed_url(user_college),
+            'college_stats': get_college_stats(user_college),
             'community_page': True,
-            'upcoming_events': upcoming_events,
-            'suggested_colleges': suggested_colleges,
-            'categories_with_types': categories_with_types,
         }
+        # Sidebar data (the college's upcoming events, suggested colleges, event filter taxonomy)
+        context.update(get_sidebar_context(request.user, college_name=user_college))
         return render(request, 'main_app/dashboard.html', context)
     else:
         # Handle case where user does not have a UserProfile
@@ -317,7 +327,9 @@ def my_community_view(request):
 @login_required
 def event_log_view(request):
     # Fetch all events where the current user is the organizer
-    my_events = Event.objects.filter(organizer=request.user).order_by('-date_time')
+    # Registration counts come from the denormalised counter rows, in the same query
+    my_events = Event.objects.filter(organizer=request.user).select_related(
+        'event_type', 'registration_counter').order_by('-date_time')
 
     context = {
         'my_events': my_events
@@ -332,7 +344,7 @@ def my_applications_view(request):
     The application details are stored in the EventApplicationDetails model.
     """
     user_applications = EventApplicationDetails.objects.filter(user=request.user).select_related(
-        'event__event_type').order_by('-applied_at')
+        'event__event_type', 'event__organizer').order_by('-applied_at')
     # Note: We are using a separate application_date field that would need to be added
     # to your EventApplicationDetails model for correct sorting if it's not there.
     # For now, we sort by event date.
@@ -355,79 +367,88 @@ def my_applications_view(request):
 @login_required
 def registrations_view(request, event_id):
     # Get the specific event or return a 404 error
-    event = get_object_or_404(Event, id=event_id, organizer=request.user)
+    # The registration count comes from the denormalised counter row, in the same query
+    event = get_object_or_404(Event.objects.select_related('registration_counter'), id=event_id,
+                              organizer=request.user)
+    try:
+        registration_count = event.registration_counter.registered_count
+    except Event.registration_counter.RelatedObjectDoesNotExist:
+        # Events created before the counters existed (see reconcile_registration_counters)
+        registration_count = 0
 
-    # Get all applications for this specific event
-    registrations = EventApplicationDetails.objects.filter(event=event).order_by('name')
+    # One page of applications for this specific event, by name
+    try:
+        registrations, next_cursor = get_registrations_page(event, cursor=request.GET.get('cursor'))
+    except InvalidCursor:
+        return redirect('registrations_view', event_id=event.id)
 
     context = {
         'event': event,
-        'registrations': registrations
+        'registrations': registrations,
+        'registration_count': registration_count,
+        'next_cursor': next_cursor,
+        'xlsx_export_available': xlsx_export_available(),
     }
     return render(request, 'main_app/registrations.html', context)
 
 
-def college_autocomplete(request):
-    query = request.GET.get('q', '')
-    colleges = College.objects.filter(name__icontains=query)[:10]  # Limit to 10 results
-    results = [{'id': college.id, 'name': college.name} for college in colleges]
-    return JsonResponse(results, safe=False)
-
-
 @login_required
-def filter_events_api(request):
-    # Base Query: Start with all upcoming events
-    events_queryset = Event.objects.filter(date_time__gte=timezone.now()).select_related('event_type').order_by(
-        'date_time')
+def export_registrations(request, event_id):
+    """Downloads every registration of the event as CSV (default) or ?format=xlsx."""
+    event = get_object_or_404(Event, id=event_id, organizer=request.user)
+    filename = f'{event.slug}-registrations'
 
-    # 1. Get Filters from GET request (REMAINS THE SAME)
-    event_type_id = request.GET.get('event_type', '')
-    fees_filter = request.GET.get('fees', '')
-    my_college_only = request.GET.get('my_college_only', 'false') == 'true'
-    applied_filter = request.GET.get('applied_filter', 'false') == 'true'
+    if request.GET.get('format') == 'xlsx':
+        spooled = tempfile.SpooledTemporaryFile(max_size=EXPORT_XLSX_MEMORY_LIMIT)
+        try:
+            write_registrations_xlsx(event, spooled)
+        except ImportError:
+            spooled.close()
+            return JsonResponse({'status': 'error', 'message': 'XLSX export is not available.'}, status=400)
+        spooled.seek(0)
+        return FileResponse(
+            spooled, as_attachment=True, filename=f'{filename}.xlsx',
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
 
-    # --- Start building complex QuerySet filters with Q objects ---
-    filters = Q()
+    response = StreamingHttpResponse(stream_registrations_csv(event), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
 
-    # 2. Filter by Event Type
-    if event_type_id:
-        filters &= Q(event_type__id=event_type_id)
 
-    # 3. Filter by Fees
-    if fees_filter == 'free':
-        filters &= Q(registration_fees__isnull=True)
-    elif fees_filter == 'paid':
-        filters &= Q(registration_fees__isnull=False)
+@login_required
+def registration_series_api(request, event_id):
+    """Per-day registration counts of one of the organiser's events: {'series': [{'date', 'count'}, ...]}."""
+    event = get_object_or_404(Event, id=event_id, organizer=request.user)
+    series = [{'date': day.isoformat(), 'count': total} for day, total in get_registration_series(event)]
+    return JsonResponse({'series': series})
 
-    # 4. Filter by My College Only (ROBUST Q LOGIC)
-    if my_college_only:
-        try:
-            user_college = request.user.userprofile.college_name
-            if user_college:
-                filters &= Q(organizer__userprofile__college_name=user_college)
-            else:
-                # If user's college is null, the result should be an empty set
-                events_queryset = events_queryset.none()
 
-        except UserProfile.DoesNotExist:
-            events_queryset = events_queryset.none()
+@login_required
+@require_POST
+def withdraw_application_view(request, event_link_key):
+    event = get_object_or_404(Event, event_link_key=event_link_key)
+    if withdraw_application(event, request.user):
+        messages.success(request, f'Your application to {event.event_name} has been withdrawn.')
+    else:
+        messages.error(request, 'You have not applied for this event.')
+    return redirect('my_applications')
 
-    # 5. Filter by Applied Events
-    if applied_filter:
-        applied_event_ids = EventApplicationDetails.objects.filter(user=request.user).values_list('event_id', flat=True)
-        filters &= Q(id__in=applied_event_ids)
 
-    # --- Apply all filters to the QuerySet ---
-    if filters:
-        events_queryset = events_queryset.filter(filters)
+def college_autocomplete(request):
+    query = request.GET.get('q', '')
+    # Served from the in-process index (main_app/colleges.py), not a table scan
+    results = autocomplete_colleges(query)
+    return JsonResponse(results, safe=False)
 
-    # ... (Rest of the function remains the same)
 
-    # Convert QuerySet to list of dictionaries for easier JSON serialization
-    # ... (REMAINS THE SAME)
+@login_required
+def filter_events_api(request):
+    """Returns the upcoming events matching the filter parameters, plus per-facet counts."""
+    event_ids, facet_counts = search_events(parse_event_filters(request.GET), request.user)
 
     # Convert QuerySet to list of dictionaries for easier JSON serialization
-    upcoming_events = list(events_queryset.values(
+    upcoming_events = list(Event.objects.filter(id__in=event_ids).order_by('date_time', 'id').values(
         'id', 'event_name', 'event_type_id', 'location', 'date_time',
         'registration_fees', 'event_link_key', 'organizer__email', 'phone_number', 'show_phone_number_on_query',
         event_type_name=F('event_type__name')
@@ -438,79 +459,109 @@ def filter_events_api(request):
         event_data['event_type'] = {'name': event_data.pop('event_type_name')}
 
     # Render the filtered events using a partial template
-    html_content = render_to_string('main_app/includes/event_list.html', {'upcoming_events': upcoming_events},
+    html_content = render_to_string('includes/event_list.html', {'upcoming_events': upcoming_events},
                                     request=request)
 
-    return JsonResponse({'html': html_content})
+    return JsonResponse({'html': html_content, 'facets': facet_counts})
 
 
-# Locate the calendar_events_api function and replace its contents.
+def _calendar_event_rows(event_ids):
+    """The calendar's JSON representation of the given events, in start-time order."""
+    rows = []
+    for event in Event.objects.filter(id__in=event_ids).order_by('date_time', 'id').values(
+            'id', 'event_name', 'date_time', 'event_link_key', 'location', 'organizer__email',
+            event_type_name=F('event_type__name')
+    ):
+        rows.append({
+            'name': event['event_name'],
+            'link_key': str(event['event_link_key']),
+            'location': event['location'],
+            'type_name': event['event_type_name'],
+            'organizer_email': event['organizer__email'],
+            # 'YYYY-MM-DD HH:MM'; its first ten characters are the day key.
+            'date_time': event['date_time'].isoformat(sep=' ', timespec='minutes')[:16],
+        })
+    return rows
 
-@login_required
-def calendar_events_api(request):
-    events_queryset = Event.objects.filter(date_time__gte=timezone.now()).select_related('event_type').order_by(
-        'date_time')
 
-    # --- 1. Get Filters from GET request ---
-    event_type_id = request.GET.get('event_type', '')
-    fees_filter = request.GET.get('fees', '')
-    my_college_only = request.GET.get('my_college_only', 'false') == 'true'
-    applied_filter = request.GET.get('applied_filter', 'false') == 'true'
-
-    # NEW FILTERS: Get College and State names
-    college_name_filter = request.GET.get('college_name', '').strip()
-    state_filter = request.GET.get('state', '').strip()
-
-    # --- 2. Apply Filters to Queryset ---
-    if event_type_id:
-        events_queryset = events_queryset.filter(event_type__id=event_type_id)
-    if fees_filter == 'free':
-        events_queryset = events_queryset.filter(registration_fees__isnull=True)
-    elif fees_filter == 'paid':
-        events_queryset = events_queryset.filter(registration_fees__isnull=False)
-
-    if my_college_only:
-        try:
-            user_college = request.user.userprofile.college_name
-            events_queryset = events_queryset.filter(organizer__userprofile__college_name=user_college)
-        except UserProfile.DoesNotExist:
-            events_queryset = events_queryset.none()
+def _calendar_day_start():
+    # Today's events stay on the calendar all day, so the window starts at midnight, not "now".
+    return timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
 
-    if applied_filter:
-        applied_event_ids = EventApplicationDetails.objects.filter(user=request.user).values_list('event_id', flat=True)
-        events_queryset = events_queryset.filter(id__in=applied_event_ids)
+def _calendar_etag(request):
+    # "Applied" depends on the user's applications, which do not bump the events version.
+    if request.GET.get('applied_filter', 'false') == 'true':
+        return None
+    user_college = ''
+    if request.GET.get('my_college_only', 'false') == 'true':
+        profile = getattr(request.user, 'userprofile', None)
+        user_college = profile.college_name if profile else ''
+    signature = '|'.join([
+        str(get_events_version()), _calendar_day_start().date().isoformat(),
+        request.GET.urlencode(), user_college,
+    ])
+    return hashlib.md5(signature.encode('utf-8')).hexdigest()
 
-    # NEW FILTER LOGIC: Apply College and State Filters
-    if college_name_filter:
-        # Filter by organizer's college name (case-insensitive search)
-        events_queryset = events_queryset.filter(organizer__userprofile__college_name__icontains=college_name_filter)
 
-    if state_filter:
-        # Filter by the location field in the Event model (assuming state is part of location/city/state)
-        events_queryset = events_queryset.filter(location__icontains=state_filter)
+def _calendar_last_modified(request):
+    if request.GET.get('applied_filter', 'false') == 'true':
+        return None
+    # The window also changes at midnight, when the previous day drops out of it.
+    return max(get_events_last_modified(), _calendar_day_start())
+
+
+# Locate the calendar_events_api function and replace its contents.
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_calendar_etag, last_modified_func=_calendar_last_modified)
+def calendar_events_api(request):
+    """
+    Returns the upcoming events of one calendar month (?month=YYYY-MM, default
+    the current month) grouped by day. Responses carry an ETag and
+    Last-Modified derived from the events version, so re-visiting a month
+    that has not changed is answered with a 304 before any event query runs.
+    """
+    try:
+        window_start, window_end = get_month_window(request.GET.get('month'))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid month, expected YYYY-MM.'}, status=400)
+
+    event_ids, facet_counts = search_events(
+        parse_event_filters(request.GET), request.user,
+        start=max(window_start, _calendar_day_start()), end=window_end,
+    )
 
     # --- 3. Return Event Details Mapped by Date ---
     event_data_by_date = {}
+    for event in _calendar_event_rows(event_ids):
+        event_data_by_date.setdefault(event['date_time'][:10], []).append(event)
 
-    for event in events_queryset.values(
-            'id', 'event_name', 'date_time', 'event_link_key', 'location', 'organizer__email',
-            event_type_name=F('event_type__name')
-    ):
-        date_str = event['date_time'].strftime('%Y-%m-%d')
+    return JsonResponse({'events_by_date': event_data_by_date, 'facets': facet_counts}, safe=False)
 
-        if date_str not in event_data_by_date:
-            event_data_by_date[date_str] = []
 
-        event_data_by_date[date_str].append({
-            'name': event['event_name'],
-            'link_key': str(event['event_link_key']),
-            'location': event['location'],
-            'type_name': event['event_type_name'],
-            'organizer_email': event['organizer__email'],
-            'date_time': event['date_time'].strftime('%Y-%m-%d %H:%M'),
-        })
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_calendar_etag, last_modified_func=_calendar_last_modified)
+def calendar_heatmap_api(request):
+    """
+    Returns {'days': {'YYYY-MM-DD': count}, 'facets': counts} for the upcoming
+    events of one calendar month (?month=YYYY-MM), with the same filters as
+    calendar_events_api but without the event rows. The events of a day are
+    fetched on click from daily_events_view (?format=json).
+    """
+    try:
+        window_start, window_end = get_month_window(request.GET.get('month'))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid month, expected YYYY-MM.'}, status=400)
+
+    heatmap = get_calendar_heatmap(
+        parse_event_filters(request.GET), request.user,
+        start=max(window_start, _calendar_day_start()), end=window_end,
+    )
+    return JsonResponse(heatmap)
 
-    return JsonResponse({'events_by_date': event_data_by_date}, safe=False)
 
 @login_required
 def daily_events_view(request, date_str):
@@ -522,6 +573,15 @@ def daily_events_view(request, date_str):
     except ValueError:
         return redirect('dashboard')  # Redirect on bad date format
 
+    if request.GET.get('format') == 'json':
+        # Calendar day click: the day's upcoming events matching the calendar filters
+        day_start = timezone.make_aware(datetime.combine(target_date, datetime.min.time()))
+        event_ids, _ = search_events(
+            parse_event_filters(request.GET), request.user,
+            start=max(day_start, _calendar_day_start()), end=day_start + timedelta(days=1),
+        )
+        return JsonResponse({'events': _calendar_event_rows(event_ids)})
+
     # Base Query: Filter by the target date
     events_queryset = Event.objects.filter(date_time__date=target_date).select_related('event_type').order_by(
         'date_time')
@@ -543,19 +603,19 @@ def toggle_follow_college(request):
     action = request.POST.get('action')
     user = request.user
 
-    # 1. Ensure the college exists
-    try:
-        # Assuming College model has a 'name' field
-        college_obj = College.objects.get(name=college_name)
-    except College.DoesNotExist:
+    # 1. Ensure the college exists (indexed, case-insensitive lookup)
+    college_obj = get_college_by_name(college_name)
+    if college_obj is None:
         return JsonResponse({'status': 'error', 'message': 'College not found'}, status=404)
+    # Follows always store the canonical spelling, so follow checks are exact matches
+    college_name = college_obj.name
 
     # 2. Implement Follow/Unfollow Logic
     if action == 'follow':
         # Create the Follow object only if it doesn't already exist
         # The Follow model takes the User object and the College name (string)
         try:
-            Follow.objects.create(follower=user, college_name=college_name)
+            Follow.objects.create(follower=user, college=college_obj, college_name=college_name)
             status = 'followed'
         except IntegrityError:
             # Already following
@@ -563,7 +623,10 @@ def toggle_follow_college(request):
 
     elif action == 'unfollow':
         # Find and delete the Follow object
-        Follow.objects.filter(follower=user, college_name=college_name).delete()
+        # Matched on the college id; follows not linked yet (see backfill_college_links) by name
+        Follow.objects.filter(follower=user).filter(
+            Q(college=college_obj) | Q(college__isnull=True, college_name=college_name)
+        ).delete()
         status = 'unfollowed'
 
     else:
@@ -590,70 +653,53 @@ def college_community_view(request, college_name):
 
     # The clean_name variable now holds the college name without the location suffix
 
-    # 2. Filter posts to show only those from the specific college (rest remains the same)
-    posts_list = Post.objects.select_related('author__userprofile').prefetch_related('media_files').filter(
-        author__userprofile__college_name=college_name
-    ).order_by('-created_at')
-
-    # 3. Fetch data needed for the sidebar (similar to the dashboard view)
-    upcoming_events = Event.objects.filter(date_time__gte=timezone.now()).select_related('event_type',
-                                                                                         'organizer').order_by(
-        'date_time')
-    suggested_colleges = list(College.objects.all().order_by('?')[:3])
-    event_categories = EventCategory.objects.all().order_by('name')
-    categories_with_types = []
-    for category in event_categories:
-        types = EventType.objects.filter(category=category).order_by('name')
-        categories_with_types.append({
-            'category': category,
-            'types': types,
-        })
+    # 2. First page of the college's posts; the rest is loaded on scroll through college_feed_api
+    posts_list, next_cursor = get_college_feed_page(college_name)
 
     context = {
         'posts_list': posts_list,
+        'next_cursor': next_cursor,
+        'feed_url': college_feed_url(college_name),
+        'college_stats': get_college_stats(college_name),
         'page_heading': f"{clean_name} - Community",  # <-- New variable for the heading text
         'is_college_community': True,  # <-- New specific flag for template
         # 'community_page_name' has been removed/renamed to 'page_heading' for clarity
         'community_page': True,
-        'upcoming_events': upcoming_events,
-        'suggested_colleges': suggested_colleges,
-        'categories_with_types': categories_with_types,
     }
+    # 3. Sidebar data (similar to the dashboard view, with this college's upcoming events)
+    context.update(get_sidebar_context(request.user, college_name=college_name))
 
     return render(request, 'main_app/dashboard.html', context)
 
 
-def state_autocomplete(request):
-    """
-    Provides a list of unique state names for autocomplete.
-    It fetches clean state names that match the query.
-    """
-    query = request.GET.get('q', '').strip()
+def college_feed_url(college_name):
+    # The college goes in the query string: names may contain '/', which a path segment cannot.
+    return f"{reverse('college_feed_api')}?{urlencode({'college': college_name})}"
 
-    # CRITICAL FIX: Directly fetch the distinct State names from the database,
-    # ensuring they start with the user's query (query__istartswith).
 
-    # This filter directly searches the cleaned State field and ignores messy text.
-    unique_states_raw = College.objects.filter(
-        state__istartswith=query  # Use istartswith for accurate, clean matching
-    ).exclude(
-        state__isnull=True
-    ).exclude(
-        state=''
-    ).values_list('state', flat=True).distinct()
+@login_required
+def college_feed_api(request):
+    """Returns the next page of a college community feed (?college=<name>) as rendered post cards."""
+    college_name = request.GET.get('college', '').strip()
+    if not college_name:
+        return JsonResponse({'status': 'error', 'message': 'A college is required.'}, status=400)
+    try:
+        posts_list, next_cursor = get_college_feed_page(college_name, cursor=request.GET.get('cursor'))
+    except InvalidCursor:
+        return JsonResponse({'status': 'error', 'message': 'Invalid cursor.'}, status=400)
 
-    # 2. Server-Side Cleaning (Just stripping and finalizing)
-    cleaned_and_filtered_states = set()
+    html_content = render_to_string('includes/post_cards.html', {'posts_list': posts_list}, request=request)
 
-    for state in unique_states_raw:
-        final_state_name = state.strip()
+    return JsonResponse({'html': html_content, 'next_cursor': next_cursor})
 
-        # Heuristic checks (remove numbers, short names)
-        if not any(char.isdigit() for char in final_state_name) and len(final_state_name) > 3:
-            cleaned_and_filtered_states.add(final_state_name)
 
-    # 3. Limit and format the results
-    final_results = sorted(list(cleaned_and_filtered_states))[:10]
+def state_autocomplete(request):
+    """
+    Provides a list of unique state names for autocomplete.
+    Served from the cached, sorted state vocabulary (main_app/states.py).
+    """
+    query = request.GET.get('q', '').strip()
+    final_results = autocomplete_states(query)
     results = [{'state_name': state} for state in final_results]
 
     return JsonResponse(results, safe=False)
@@ -687,6 +733,11 @@ def profile_view(request):
             # The profile_form handles the file upload automatically
             profile_form.save()
 
+            # A new college changes whose posts belong in the home timeline
+            if 'college_name' in profile_form.changed_data:
+                rebuild_timeline(request.user)
+                refresh_suggestions(request.user)
+
             messages.success(request, 'Your profile has been updated successfully!')
             return redirect('profile')  # Redirects back to the profile page
         else:
@@ -738,6 +789,10 @@ def mandatory_profile_setup_view(request):
             profile.setup_complete = True
             profile.save()
 
+            # Seed the home timeline and college suggestions from the chosen college
+            rebuild_timeline(user)
+            refresh_suggestions(user)
+
             messages.success(request, 'Profile setup complete! Welcome to the dashboard.')
             return redirect('dashboard')
         else:
@@ -882,22 +937,27 @@ def social_login_start_view(request):
 def event_detail_view(request, event_link_key):
     """
     Handles displaying the details for a single event.
+    Anonymous visitors (shared links) get a cached copy of the page until the event is saved or deleted.
     """
+    cache_key = event_page_cache_key(event_link_key)
+    anonymous = not request.user.is_authenticated
+    if anonymous:
+        content = cache.get(cache_key)
+        if content is not None:
+            return HttpResponse(content)
+
     # Use the event_link_key (UUID) to fetch the specific Event object
-    # Assuming 'event_link_key' is the field name on your Event model
-    event = get_object_or_404(Event, event_link_key=event_link_key)
+    event = get_object_or_404(Event.objects.select_related('event_type'), event_link_key=event_link_key)
 
     context = {
         'event': event,
         'page_title': event.event_name  # Dynamically set the title
     }
 
-    # You will need to create the 'main_app/event_detail.html' template
-    return render(request, 'main_app/event_detail.html', context)
-
-
-
-
+    response = render(request, 'main_app/event_details_by_key.html', context)
+    if anonymous:
+        cache.set(cache_key, response.content, EVENT_PAGE_CACHE_TIMEOUT)
+    return response
 
 
 @csrf_exempt  # This is essential to allow external POST requests from Meta
@@ -964,8 +1024,7 @@ def instagram_webhook(request):
                                 # Use media_id as the content source for unique identification
                                 post = Post.objects.create(
                                     author=admin_user,
-                                    content=post_data.get('caption', 'New post from Instagram.'),
-                                    source_link=post_data.get('permalink', ''),
+                                    post_text=post_data.get('caption', 'New post from Instagram.'),
                                 )
 
                                 # --- 5. Save the Media File to Cloudinary/Filesystem ---